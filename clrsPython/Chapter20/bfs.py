@@ -30,6 +30,7 @@
 #                                                                       #
 #########################################################################
 
+from collections import deque
 from fifo_queue import Queue
 from adjacency_list_graph import AdjacencyListGraph
 from print_path import print_path
@@ -69,6 +70,56 @@ def bfs(G, source):
 	return dist, pi
 
 
+def bfs_fast(G, sources, target=None, max_hops=None):
+	"""Perform breadth-first search from one or more sources, with a deque as the
+	queue and integer distances, which also serve as the colors: -1 is white.
+
+	Arguments:
+	G -- the graph, implemented with adjacency lists or as a CSRGraph
+	sources -- index of the source vertex, or a list of source vertices all at distance 0
+	target -- optional vertex at which to stop, as soon as it is discovered
+	max_hops -- optional limit on the distance; vertices farther away are left unreached
+
+	Returns:
+	dist -- dist[i] is the number of edges on a shortest path from the nearest source
+	to vertex i, or -1 if i was not reached.  When stopping early at target, only
+	dist[target] and the distances of vertices closer than it are certain to be final.
+	pi -- predecessors, None for sources and unreached vertices
+	"""
+	card_V = G.get_card_V()
+	if not hasattr(sources, "__iter__"):
+		sources = [sources]
+	dist = [-1] * card_V
+	pi = [None] * card_V
+	queue = deque()
+	for s in sources:
+		if dist[s] < 0:
+			dist[s] = 0
+			queue.append(s)
+	if target is not None and dist[target] == 0:
+		return dist, pi
+	arrays = G.get_arrays() if hasattr(G, "get_arrays") else None
+
+	while queue:
+		u = queue.popleft()
+		d_v = dist[u] + 1
+		if max_hops is not None and d_v > max_hops:
+			break  # everything still in the queue is at least as far as u
+		if arrays is not None:
+			offsets, neighbors, _ = arrays
+			adjacent = neighbors[offsets[u]:offsets[u + 1]]
+		else:
+			adjacent = (edge.v for edge in G.get_adj_list(u))
+		for v in adjacent:
+			if dist[v] < 0:  # is v being discovered now?
+				dist[v] = d_v
+				pi[v] = u
+				if v == target:
+					return dist, pi
+				queue.append(v)
+	return dist, pi
+
+
 # Testing
 if __name__ == "__main__":
 
@@ -101,3 +152,27 @@ if __name__ == "__main__":
 	for i in range(card_V):
 		print(vertices[i] + ": dist = " + str(dist[i]) + ", path = " + \
 				str(print_path(predecessor, s, i, lambda i: vertices[i])))
+	print()
+
+	# bfs_fast agrees with bfs, on adjacency lists and CSR, and supports several sources,
+	# a hop limit, and stopping at a target.
+	from csr_graph import CSRGraph
+	dist_fast, pi_fast = bfs_fast(graph2, s)
+	print(dist_fast == dist and pi_fast == predecessor)
+	card_V = 2000
+	graph3 = generate_random_graph(card_V, 0.002, True)
+	csr3 = CSRGraph.from_adjacency_list_graph(graph3)
+	all_equal = True
+	for s in range(0, card_V, 97):
+		dist = [-1 if d == float('inf') else d for d in bfs(graph3, s)[0]]
+		all_equal = all_equal and bfs_fast(graph3, s)[0] == dist == bfs_fast(csr3, s)[0]
+	print(all_equal)
+	sources = [0, 1, 2]
+	multi = bfs_fast(csr3, sources)[0]
+	print(multi == [min((d for d in column if d >= 0), default=-1)
+					for column in zip(*(bfs_fast(csr3, source)[0] for source in sources))])
+	full = bfs_fast(csr3, 0)[0]
+	limited = bfs_fast(csr3, 0, max_hops=2)[0]
+	print(limited == [d if d <= 2 else -1 for d in full])
+	t = max(range(card_V), key=lambda v: full[v])  # a farthest vertex
+	print(bfs_fast(csr3, 0, target=t)[0][t] == full[t])
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# biconnected_components.py
+
+# Bridges, articulation points, and biconnected components of an undirected graph,
+# found by Tarjan's algorithm in one depth-first search, in O(V + E) time.  For each
+# vertex u, low[u] is the smallest discovery time of a vertex reachable from the
+# subtree rooted at u by tree edges followed by at most one back edge.  For a tree
+# edge (u, v):
+#   low[v] >= u.d   -- u separates v's subtree from the rest of its component, so u is
+#                      an articulation point (unless it is a root with one child), and
+#                      the edges examined since (u, v) form a biconnected component;
+#   low[v] >  u.d   -- no back edge jumps over (u, v), so (u, v) is a bridge.
+#
+# The search keeps an explicit stack, like dfs_visit, so long paths cannot overflow
+# Python's recursion limit.
+
+
+def biconnected_components(G):
+	"""Find the bridges, articulation points, and biconnected components of an
+	undirected graph.
+
+	Arguments:
+	G -- an undirected graph represented by adjacency lists (AdjacencyListGraph or CSRGraph)
+
+	Returns:
+	bridges -- list of edges (u, v) whose removal disconnects their component, with u
+	the endpoint discovered first
+	articulation_points -- sorted list of vertices whose removal disconnects their component
+	components -- list of the biconnected components, each a list of edges (u, v); every
+	edge of G is in exactly one component, and a bridge is a component by itself
+	"""
+	card_V = G.get_card_V()
+	d = [0] * card_V  # discovery times, starting at 1; 0 for undiscovered
+	low = [0] * card_V
+	pi = [None] * card_V
+	skipped_parent = [False] * card_V  # has u passed over the tree edge to pi[u]?
+	is_articulation = [False] * card_V
+	bridges = []
+	components = []
+	edge_stack = []  # edges not yet assigned to a component
+	time = 0
+
+	for s in range(card_V):
+		if d[s] != 0:
+			continue
+		time += 1
+		d[s] = low[s] = time
+		root_children = 0
+		stack = [(s, iter(G.get_adj_list(s)))]
+		while stack:
+			u, edges = stack[-1]
+			for edge in edges:
+				v = edge.get_v()
+				if d[v] == 0:  # tree edge
+					pi[v] = u
+					time += 1
+					d[v] = low[v] = time
+					edge_stack.append((u, v))
+					if u == s:
+						root_children += 1
+					stack.append((v, iter(G.get_adj_list(v))))
+					break
+				if v == pi[u] and not skipped_parent[u]:
+					skipped_parent[u] = True  # the tree edge itself, seen from below
+				elif d[v] < d[u]:  # back edge to an ancestor
+					edge_stack.append((u, v))
+					if d[v] < low[u]:
+						low[u] = d[v]
+			else:
+				# u is finished.
+				stack.pop()
+				p = pi[u]
+				if p is None:
+					continue
+				if low[u] < low[p]:
+					low[p] = low[u]
+				if low[u] >= d[p]:
+					if p != s:
+						is_articulation[p] = True
+					component = []
+					while True:
+						e = edge_stack.pop()
+						component.append(e)
+						if e == (p, u):
+							break
+					components.append(component)
+					if low[u] > d[p]:
+						bridges.append((p, u))
+		if root_children > 1:
+			is_articulation[s] = True
+
+	articulation_points = [u for u in range(card_V) if is_articulation[u]]
+	return bridges, articulation_points, components
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from random import randint, sample
+	from adjacency_list_graph import AdjacencyListGraph
+	from generate_random_graph import generate_random_graph
+
+	def connected_pieces(G, removed_vertex=None, removed_edge=None):
+		"""Count the connected components of G without one vertex or one edge."""
+		card_V = G.get_card_V()
+		seen = [False] * card_V
+		if removed_vertex is not None:
+			seen[removed_vertex] = True
+		pieces = 0
+		for s in range(card_V):
+			if seen[s]:
+				continue
+			pieces += 1
+			seen[s] = True
+			stack = [s]
+			while stack:
+				u = stack.pop()
+				for edge in G.get_adj_list(u):
+					v = edge.get_v()
+					if not seen[v] and {u, v} != removed_edge:
+						seen[v] = True
+						stack.append(v)
+		return pieces
+
+	def brute_force(G):
+		"""Find bridges and articulation points by deleting each edge and vertex in turn."""
+		pieces = connected_pieces(G)
+		bridges = {frozenset(e) for e in G.get_edge_list()
+				   if connected_pieces(G, removed_edge=set(e)) > pieces}
+		articulation_points = [u for u in range(G.get_card_V())
+							   if any(True for _ in G.get_adj_list(u))
+							   and connected_pieces(G, removed_vertex=u) > pieces]
+		return bridges, articulation_points
+
+	# Two cycles joined by a path, plus a separate edge.
+	#   0 - 1 - 2 - 0,   2 - 3,   3 - 4 - 5 - 3,   6 - 7
+	graph1 = AdjacencyListGraph(8, False)
+	for u, v in [(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 5), (5, 3), (6, 7)]:
+		graph1.insert_edge(u, v)
+	bridges, articulation_points, components = biconnected_components(graph1)
+	print(bridges, articulation_points)
+	print(sorted(sorted(tuple(sorted(e)) for e in c) for c in components))
+
+	# Random sparse graphs against deleting every edge and vertex.
+	all_equal = True
+	for _ in range(30):
+		card_V = randint(2, 40)
+		graph2 = generate_random_graph(card_V, 1.5 / card_V, True, False)
+		bridges, articulation_points, components = biconnected_components(graph2)
+		expected_bridges, expected_points = brute_force(graph2)
+		all_equal = all_equal and {frozenset(e) for e in bridges} == expected_bridges \
+			and articulation_points == expected_points \
+			and sorted(tuple(sorted(e)) for c in components for e in c) == sorted(graph2.get_edge_list())
+	print(all_equal)
+
+	# A path of a million vertices: every edge is a bridge.
+	n = 10**6
+	graph3 = AdjacencyListGraph(n, False, False, False)
+	for u in range(n - 1):
+		graph3.insert_edge(u, u + 1)
+	start = time.perf_counter()
+	bridges, articulation_points, components = biconnected_components(graph3)
+	print(f"Path of {n} vertices: {time.perf_counter() - start:.2f}s,",
+		  len(bridges) == n - 1, len(articulation_points) == n - 2)
+
+	# Tube-like network: a ring with random chords and some spurs.
+	n = 200000
+	graph4 = AdjacencyListGraph(n, False, False, False)
+	for u in range(n // 2):
+		graph4.insert_edge(u, (u + 1) % (n // 2))
+	for u in range(n // 2, n):
+		graph4.insert_edge(u, randint(0, u - 1))
+	for u, v in (sample(range(n), 2) for _ in range(n // 10)):
+		if not graph4.has_edge(u, v):
+			graph4.insert_edge(u, v)
+	start = time.perf_counter()
+	bridges, articulation_points, components = biconnected_components(graph4)
+	print(f"{n} stations, {graph4.get_card_E()} links: {time.perf_counter() - start:.2f}s, "
+		  f"{len(bridges)} bridges, {len(articulation_points)} articulation points")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# bit_parallel_bfs.py
+
+# Breadth-first search from 64 sources at once.  Each vertex v carries two 64-bit
+# words: bit b of seen[v] says that source b has reached v, and bit b of frontier[v]
+# says that v is on source b's current frontier.  One level of all 64 searches is
+#     next[v] = (OR of frontier[u] over the edges (u, v)) AND NOT seen[v],
+# a gather and a segmented OR over the edge arrays, done by NumPy.  The hop counts
+# of the vertices discovered at that level are then read off the bits of next.
+
+import numpy as np
+from csr_graph import CSRGraph
+
+
+def all_pairs_hops(G, sources=None, dtype=None):
+	"""Compute the number of edges on a shortest path from each source to every vertex.
+
+	Arguments:
+	G -- the graph, as a CSRGraph or implemented with adjacency lists
+	sources -- list of source vertices; defaults to all vertices
+	dtype -- np.uint8, np.uint16 or np.uint32 for the result.  By default uint8 is used,
+	widened to uint16, and then to uint32, if some distance does not fit.
+
+	Returns:
+	A len(sources) x card_V matrix whose row i holds the hop counts from sources[i].
+	Vertices unreachable from a source hold the largest value of the dtype.
+	"""
+	if not hasattr(G, "get_arrays"):
+		G = CSRGraph.from_adjacency_list_graph(G)
+	card_V = G.get_card_V()
+	sources = np.arange(card_V) if sources is None else np.asarray(sources, dtype=np.int64)
+	# Pull from the in-neighbors: next[v] gathers from the vertices with edges into v.
+	in_offsets, in_neighbors, _ = G.transpose().get_arrays()
+	in_offsets = np.asarray(in_offsets, dtype=np.int64)
+	in_neighbors = np.asarray(in_neighbors, dtype=np.int64)
+	has_in = np.flatnonzero(np.diff(in_offsets) > 0)
+	segment_starts = in_offsets[has_in]
+
+	D = np.full((len(sources), card_V), np.iinfo(dtype or np.uint8).max, dtype=dtype or np.uint8)
+	one = np.uint64(1)
+	for batch in range(0, len(sources), 64):
+		batch_sources = sources[batch:batch + 64]
+		k = len(batch_sources)
+		rows = D[batch:batch + k]  # a view, so results land in D
+		seen = np.zeros(card_V, dtype=np.uint64)
+		bits = one << np.arange(k, dtype=np.uint64)
+		np.bitwise_or.at(seen, batch_sources, bits)  # two batch entries may share a source
+		rows[np.arange(k), batch_sources] = 0
+		frontier = seen.copy()
+		level = 0
+		while True:
+			level += 1
+			gathered = frontier[in_neighbors]
+			next_frontier = np.zeros(card_V, dtype=np.uint64)
+			if len(segment_starts) > 0:
+				next_frontier[has_in] = np.bitwise_or.reduceat(gathered, segment_starts)
+			next_frontier &= ~seen
+			reached = np.flatnonzero(next_frontier)
+			if len(reached) == 0:
+				break
+			seen[reached] |= next_frontier[reached]
+			if level >= np.iinfo(D.dtype).max:
+				if dtype is not None or D.dtype == np.uint32:
+					raise ValueError("Hop counts do not fit in " + str(D.dtype) + ".")
+				D = _widen(D, np.uint16 if D.dtype == np.uint8 else np.uint32)
+				rows = D[batch:batch + k]
+			# Bit b of next_frontier[v] set means source b reaches v at this level.
+			new_bits = np.unpackbits(next_frontier[reached].view(np.uint8).reshape(-1, 8),
+									 axis=1, bitorder='little')[:, :k]
+			b, v = np.nonzero(new_bits.T)
+			rows[b, reached[v]] = level
+			frontier = next_frontier
+	return D
+
+
+def _widen(D, dtype):
+	"""Convert a hop matrix to a wider unsigned dtype, keeping unreachable entries unreachable."""
+	wide = D.astype(dtype)
+	wide[D == np.iinfo(D.dtype).max] = np.iinfo(dtype).max
+	return wide
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from bfs import bfs_fast
+	from adjacency_list_graph import AdjacencyListGraph
+	from generate_random_graph import generate_random_graph
+
+	def expected_hops(G, sources, unreachable):
+		"""Run one BFS per source."""
+		rows = []
+		for s in sources:
+			dist = bfs_fast(G, int(s))[0]
+			rows.append([unreachable if d < 0 else d for d in dist])
+		return np.array(rows)
+
+	# Textbook example.
+	vertices = ['r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z']
+	edges = [('r', 's'), ('r', 't'), ('r', 'w'), ('s', 'u'), ('s', 'v'),
+			 ('t', 'u'), ('u', 'y'), ('v', 'w'), ('v', 'y'), ('w', 'x'),
+			 ('w', 'z'), ('x', 'y'), ('x', 'z')]
+	graph1 = AdjacencyListGraph(len(vertices), False)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]))
+	print(all_pairs_hops(graph1))
+
+	# Directed random graph with unreachable vertices, more than one batch of sources,
+	# and a path too long for uint8.
+	card_V = 300
+	graph2 = generate_random_graph(card_V, 0.005, True, True)
+	print(np.array_equal(all_pairs_hops(graph2), expected_hops(graph2, range(card_V), 255)))
+	graph3 = AdjacencyListGraph(400, True)
+	for u in range(399):
+		graph3.insert_edge(u, u + 1)
+	hops3 = all_pairs_hops(graph3, [0, 5, 0])
+	print(hops3.dtype, np.array_equal(hops3, expected_hops(graph3, [0, 5, 0], 65535)))
+	# A path too long for uint16 as well; the 255-hop entries must survive both widenings.
+	n = 65600
+	graph_long = CSRGraph.from_arrays(n, np.arange(n - 1), np.arange(1, n))
+	hops_long = all_pairs_hops(graph_long, [0, n - 1])
+	print(hops_long.dtype, np.array_equal(hops_long[0], np.arange(n)),
+		  np.all(hops_long[1, :-1] == np.iinfo(np.uint32).max), hops_long[1, -1] == 0)
+
+	# A few thousand stations: all sources at once against one BFS per source.
+	n = 3000
+	us = np.repeat(np.arange(n), 3)
+	vs = np.random.randint(0, n, len(us))
+	keep = us != vs
+	pairs = np.unique(np.minimum(us[keep], vs[keep]) * n + np.maximum(us[keep], vs[keep]))
+	graph4 = CSRGraph.from_arrays(n, pairs // n, pairs % n, directed=False)
+	start = time.perf_counter()
+	expected = expected_hops(graph4, range(n), 255)
+	print(f"{n} separate BFS runs: {time.perf_counter() - start:.2f}s")
+	start = time.perf_counter()
+	hops4 = all_pairs_hops(graph4)
+	print(f"all_pairs_hops: {time.perf_counter() - start:.2f}s, {hops4.nbytes / 2**20:.1f} MiB")
+	print(np.array_equal(hops4, expected))
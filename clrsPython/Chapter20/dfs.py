@@ -37,6 +37,29 @@ GRAY = 1   # discovered
 BLACK = 2  # visited
 
 
+class DFSResult:
+
+	def __init__(self, card_V):
+		"""Initialize the lists filled in by depth-first search.
+
+		Instance variables:
+		d -- list of vertex discovery times
+		f -- list of vertex finish times
+		pi -- list of depth-first vertex predecessors
+		color -- list of vertex colors
+		time -- the timestamp, counting discoveries and finishes so far
+		"""
+		self.d = [None] * card_V 	# discovery times
+		self.f = [None] * card_V 	# finish times
+		self.pi = [None] * card_V
+		self.color = [WHITE] * card_V  # vertices are numbered, color[0] corresponds with color of vertex 0.
+		self.time = 0
+
+	def __iter__(self):
+		"""Allow d, f, pi = dfs(G)."""
+		return iter((self.d, self.f, self.pi))
+
+
 def dfs(G, start_dfs_tree=None, discover_func=None, finish_func=None, order=None):
 	"""Perform depth-first search on a graph represented by adjacency lists.
 
@@ -52,35 +75,30 @@ def dfs(G, start_dfs_tree=None, discover_func=None, finish_func=None, order=None
 	of the vertices.
 
 	Returns:
-	d -- list of vertex discovery times
-	f -- list of vertex finish times
-	pi -- list of depth-first vertex predecessors
+	A DFSResult, whose d, f, and pi lists give the vertex discovery times, finish times,
+	and depth-first predecessors.  It unpacks as d, f, pi.
+
+	All state is local to the call, so searches may run at the same time in different
+	threads, and an explicit stack replaces recursion, so there is no depth limit.
 	"""
-	# Initialize color, pi, distance, and finish time lists.
-	global time, color, pi, d, f
-	time = 0  # global timestamp
-	card_V = G.get_card_V()
-	color = [WHITE] * card_V  # vertices are numbered, color[0] corresponds with color of vertex 0.
-	pi = [None] * card_V
-	d = [None] * card_V 	# discovery times
-	f = [None] * card_V 	# finish times
+	result = DFSResult(G.get_card_V())
 
 	# Default order for starting searches goes from vertex 0 to vertex (card_V - 1).
 	if order is None:
-		order = range(card_V)
+		order = range(G.get_card_V())
 
 	# Visit each unvisited vertex.
 	for u in order:
-		if color[u] == WHITE:
+		if result.color[u] == WHITE:
 			if start_dfs_tree is not None:
 				start_dfs_tree()
 			if discover_func is not None:
 				discover_func(u)  # discover first vertex in this depth-first tree
-			dfs_visit(G, u, discover_func, finish_func)  # DFS from vertex u
-	return d, f, pi
+			dfs_visit(G, u, discover_func, finish_func, result)  # DFS from vertex u
+	return result
 
 
-def dfs_visit(G, u, discover_func, finish_func):
+def dfs_visit(G, u, discover_func, finish_func, result):
 	"""Perform depth-first search on a graph represented by adjacency lists, starting
 	from a given vertex.
 
@@ -91,26 +109,38 @@ def dfs_visit(G, u, discover_func, finish_func):
 	an edge in a graph, taking the vertex as an argument.  Defaults to do nothing.
 	finish_func -- function called upon finishing a vertex in a graph, taking the
 	vertex as an argument.  Defaults to do nothing.
+	result -- the DFSResult whose timestamp and lists are updated
 
-	Updates the global timestamp time and the global lists color, pi, d, and f.
+	The stack holds, for each gray vertex, an iterator over the edges it has yet to
+	explore, so vertices are discovered and finished in the same order as by the
+	recursive procedure.
 	"""
-	global time, color, pi, d, f
-	time += 1  # white vertex u has just been discovered
-	d[u] = time
+	d, f, pi, color = result.d, result.f, result.pi, result.color
+	result.time += 1  # white vertex u has just been discovered
+	d[u] = result.time
 	color[u] = GRAY
-
-	for edge in G.get_adj_list(u):  # explore each edge (u, v)
-		v = edge.get_v()
-		if color[v] == WHITE:
-			if discover_func is not None:
-				discover_func(v)  # do something with vertex v upon discovering it
-			pi[v] = u
-			dfs_visit(G, v, discover_func, finish_func)
-	time += 1
-	f[u] = time
-	color[u] = BLACK  # black u; it is finished
-	if finish_func is not None:
-		finish_func(u)  # do something with vertex v upon finishing it
+	stack = [(u, iter(G.get_adj_list(u)))]
+
+	while stack:
+		u, edges = stack[-1]
+		for edge in edges:  # explore each remaining edge (u, v)
+			v = edge.get_v()
+			if color[v] == WHITE:
+				if discover_func is not None:
+					discover_func(v)  # do something with vertex v upon discovering it
+				pi[v] = u
+				result.time += 1  # white vertex v has just been discovered
+				d[v] = result.time
+				color[v] = GRAY
+				stack.append((v, iter(G.get_adj_list(v))))
+				break  # continue from v; u's iterator resumes once v is finished
+		else:
+			stack.pop()
+			result.time += 1
+			f[u] = result.time
+			color[u] = BLACK  # black u; it is finished
+			if finish_func is not None:
+				finish_func(u)  # do something with vertex u upon finishing it
 
 
 # Testing
@@ -133,3 +163,20 @@ if __name__ == "__main__":
 			print(pi[v])
 		else:
 			print(vertices[pi[v]])
+	print()
+
+	# A path of a million vertices, far deeper than the recursion limit.
+	from csr_graph import CSRGraph
+	card_V = 10**6
+	path = CSRGraph.from_arrays(card_V, np.arange(card_V - 1), np.arange(1, card_V))
+	result = dfs(path)
+	print(result.f[0] == 2 * card_V, result.pi[card_V - 1] == card_V - 2)
+
+	# Searches running in several threads at once do not interfere.
+	from concurrent.futures import ThreadPoolExecutor
+	from generate_random_graph import generate_random_graph
+	graphs = [generate_random_graph(300, 0.01) for _ in range(8)]
+	expected = [list(dfs(graph)) for graph in graphs]
+	with ThreadPoolExecutor(max_workers=8) as executor:
+		results = list(executor.map(lambda graph: list(dfs(graph)), graphs))
+	print(results == expected)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# direction_optimizing_bfs.py
+
+# Direction-optimizing breadth-first search (Beamer, Asanovic, and Patterson).  BFS
+# proceeds one level at a time.  A top-down step scans the edges leaving the frontier,
+# which is cheap while the frontier is small.  On a graph of small diameter the
+# frontier soon holds a large part of the graph, and most of those edges lead to
+# vertices already discovered.  A bottom-up step instead has each undiscovered vertex
+# look for any neighbor in the frontier, stopping at the first one found, and so
+# examines far fewer edges on the middle levels.
+#
+# Both kinds of step work on whole levels with NumPy: the frontier is a bool bitmap
+# over the vertices, and the bottom-up step examines the first neighbor of every
+# undiscovered vertex at once, then the second neighbor of those still without a
+# parent, and so on.
+
+import numpy as np
+from csr_graph import CSRGraph
+
+
+def _top_down_step(offsets, neighbors, frontier, dist, pi, level):
+	"""Discover the undiscovered neighbors of the frontier vertices, returning them."""
+	starts = offsets[frontier]
+	degrees = offsets[frontier + 1] - starts
+	total = int(degrees.sum())
+	if total == 0:
+		return frontier[:0]
+	# Positions of all edges leaving the frontier, without a Python loop.
+	ends = np.cumsum(degrees)
+	positions = np.arange(total) + np.repeat(starts - (ends - degrees), degrees)
+	targets = neighbors[positions]
+	parents = np.repeat(frontier, degrees)
+	new = dist[targets] < 0
+	targets, first = np.unique(targets[new], return_index=True)
+	dist[targets] = level
+	pi[targets] = parents[new][first]
+	return targets
+
+
+def _bottom_up_step(in_offsets, in_neighbors, in_frontier, unvisited, dist, pi, level):
+	"""Give each undiscovered vertex with a neighbor in the frontier its first such
+	neighbor as parent, returning the vertices discovered."""
+	found = []
+	candidates = unvisited
+	j = 0
+	while len(candidates) > 0:
+		candidates = candidates[in_offsets[candidates + 1] - in_offsets[candidates] > j]
+		if len(candidates) == 0:
+			break
+		u = in_neighbors[in_offsets[candidates] + j]  # the j-th neighbor of each candidate
+		hit = in_frontier[u]
+		discovered = candidates[hit]
+		dist[discovered] = level
+		pi[discovered] = u[hit]
+		found.append(discovered)
+		candidates = candidates[~hit]
+		j += 1
+	return np.concatenate(found) if found else unvisited[:0]
+
+
+def _numpy_arrays(G):
+	"""Return (offsets, neighbors) of a CSRGraph G as NumPy arrays."""
+	offsets, neighbors, _ = G.get_arrays()
+	return np.asarray(offsets, dtype=np.int64), np.asarray(neighbors, dtype=np.int64)
+
+
+def direction_optimizing_bfs(G, source, alpha=14, beta=24, as_arrays=False):
+	"""Perform breadth-first search, choosing top-down or bottom-up steps level by level.
+
+	Arguments:
+	G -- the graph, as a CSRGraph or implemented with adjacency lists
+	source -- index of the source vertex
+	alpha -- switch to bottom-up steps once the edges leaving the frontier number more
+	than 1/alpha of the edges at undiscovered vertices
+	beta -- switch back to top-down steps once the frontier holds fewer than 1/beta of
+	the vertices and its edges are again below the alpha threshold
+	as_arrays -- return NumPy int arrays, with -1 for unreached vertices and no predecessor
+
+	Returns:
+	dist -- dist[i] is the distance from the source to vertex i, inf if unreachable
+	pi -- predecessors, None for the source and unreachable vertices.  A predecessor
+	is always a vertex one level nearer the source, though when several are, not
+	necessarily the one bfs would choose.
+	"""
+	card_V = G.get_card_V()
+	if not hasattr(G, "get_arrays"):
+		G = CSRGraph.from_adjacency_list_graph(G)
+	offsets, neighbors = _numpy_arrays(G)
+	in_offsets, in_neighbors = _numpy_arrays(G.transpose())  # the same arrays if undirected
+	out_degree = np.diff(offsets)
+	in_degree = np.diff(in_offsets)
+
+	dist = np.full(card_V, -1, dtype=np.int64)
+	pi = np.full(card_V, -1, dtype=np.int64)
+	dist[source] = 0
+	frontier = np.array([source], dtype=np.int64)
+	unvisited_edges = int(in_degree.sum()) - int(in_degree[source])
+	bottom_up = False
+	level = 0
+
+	while len(frontier) > 0:
+		level += 1
+		frontier_edges = int(out_degree[frontier].sum())
+		if not bottom_up and frontier_edges > unvisited_edges / alpha:
+			bottom_up = True
+		elif bottom_up and len(frontier) < card_V / beta and frontier_edges < unvisited_edges / alpha:
+			bottom_up = False
+
+		if bottom_up:
+			in_frontier = np.zeros(card_V, dtype=bool)
+			in_frontier[frontier] = True
+			unvisited = np.flatnonzero(dist < 0)
+			frontier = _bottom_up_step(in_offsets, in_neighbors, in_frontier, unvisited, dist, pi, level)
+		else:
+			frontier = _top_down_step(offsets, neighbors, frontier, dist, pi, level)
+		unvisited_edges -= int(in_degree[frontier].sum())
+
+	if as_arrays:
+		return dist, pi
+	inf = float('inf')
+	return [inf if d < 0 else d for d in dist.tolist()], [None if p < 0 else p for p in pi.tolist()]
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from bfs import bfs, bfs_fast
+	from adjacency_list_graph import AdjacencyListGraph
+	from generate_random_graph import generate_random_graph
+
+	def valid_tree(G, dist, pi, source):
+		"""Check that every predecessor is an adjacent vertex one level nearer the source."""
+		for v in range(G.get_card_V()):
+			if v == source or pi[v] is None:
+				continue
+			if dist[pi[v]] != dist[v] - 1 or not G.has_edge(pi[v], v):
+				return False
+		return True
+
+	# Textbook example.
+	vertices = ['r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z']
+	edges = [('r', 's'), ('r', 't'), ('r', 'w'), ('s', 'u'), ('s', 'v'),
+			 ('t', 'u'), ('u', 'y'), ('v', 'w'), ('v', 'y'), ('w', 'x'),
+			 ('w', 'z'), ('x', 'y'), ('x', 'z')]
+	graph1 = AdjacencyListGraph(len(vertices), False)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]))
+	s = vertices.index('s')
+	dist, pi = direction_optimizing_bfs(graph1, s)
+	print(dist == bfs(graph1, s)[0], valid_tree(graph1, dist, pi, s))
+
+	# Directed and undirected random graphs, forcing both kinds of step.
+	all_equal = True
+	for directed in (True, False):
+		graph2 = generate_random_graph(500, 0.01, True, directed)
+		for s in range(0, 500, 50):
+			expected = bfs(graph2, s)[0]
+			for alpha in (1e-9, 14, 1e9):
+				dist, pi = direction_optimizing_bfs(graph2, s, alpha)
+				all_equal = all_equal and dist == expected and valid_tree(graph2, dist, pi, s)
+	print(all_equal)
+
+	# Random tube-like graph with a million stations, as in task3/3B part 1.
+	n = 10**6
+	rng = np.random.default_rng(1)
+	us = np.repeat(np.arange(n), 3)
+	vs = rng.integers(0, n, len(us))
+	keep = us != vs
+	keys = np.unique(np.minimum(us[keep], vs[keep]) * n + np.maximum(us[keep], vs[keep]))
+	graph3 = CSRGraph.from_arrays(n, keys // n, keys % n, directed=False)
+	start = time.perf_counter()
+	dist_fast = bfs_fast(graph3, 0)[0]
+	print(f"bfs_fast, {n} vertices: {time.perf_counter() - start:.2f}s")
+	start = time.perf_counter()
+	dist, pi = direction_optimizing_bfs(graph3, 0, as_arrays=True)
+	print(f"direction_optimizing_bfs, {n} vertices: {time.perf_counter() - start:.2f}s")
+	print(dist.tolist() == dist_fast)
@@ -30,8 +30,10 @@
 #                                                                       #
 #########################################################################
 
+import numpy as np
 from dfs import dfs
 from counting_sort import counting_sort
+from csr_graph import CSRGraph
 
 
 def strongly_connected_components(G):
@@ -62,9 +64,124 @@ def strongly_connected_components(G):
 	return components
 
 
+def tarjan_scc(G):
+	"""Compute the strongly connected components of a directed graph by Tarjan's
+	algorithm: a single depth-first search, with no transpose of the graph.  Each vertex
+	u gets low[u], the smallest discovery index of a vertex still on the stack that u's
+	subtree reaches by one back or cross edge.  A vertex with low[u] equal to its own
+	index is the root of a component, which is then popped off the stack.
+
+	Arguments:
+	G -- a directed graph (AdjacencyListGraph or CSRGraph)
+
+	Returns:
+	component -- int array, component[u] is the component of vertex u.  Components are
+	numbered 0, 1, ... in topological order of the component graph, so every edge
+	between components goes from a lower number to a higher one.
+	"""
+	if not G.is_directed():
+		raise RuntimeError("Graph must be directed.")
+	if not hasattr(G, "get_arrays"):
+		G = CSRGraph.from_adjacency_list_graph(G)
+	card_V = G.get_card_V()
+	offsets, neighbors, _ = G.get_arrays()
+	offsets = offsets.tolist()
+	neighbors = neighbors.tolist()
+
+	index = [-1] * card_V  # discovery index, -1 if undiscovered
+	low = [0] * card_V
+	on_stack = [False] * card_V
+	component = [0] * card_V
+	next_edge = offsets[:-1]  # position of the next edge to examine from each vertex
+	stack = []  # vertices discovered but not yet assigned to a component
+	count = 0
+	num_components = 0
+
+	for s in range(card_V):
+		if index[s] >= 0:
+			continue
+		index[s] = low[s] = count
+		count += 1
+		stack.append(s)
+		on_stack[s] = True
+		path = [s]  # the vertices whose searches are under way, replacing recursion
+		while path:
+			u = path[-1]
+			i = next_edge[u]
+			end = offsets[u + 1]
+			while i < end:
+				v = neighbors[i]
+				i += 1
+				if index[v] < 0:
+					break
+				if on_stack[v] and index[v] < low[u]:
+					low[u] = index[v]
+			else:
+				# u is finished.
+				next_edge[u] = i
+				path.pop()
+				if low[u] == index[u]:
+					while True:
+						w = stack.pop()
+						on_stack[w] = False
+						component[w] = num_components
+						if w == u:
+							break
+					num_components += 1
+				if path and low[u] < low[path[-1]]:
+					low[path[-1]] = low[u]
+				continue
+			# Descend to the undiscovered vertex v.
+			next_edge[u] = i
+			index[v] = low[v] = count
+			count += 1
+			stack.append(v)
+			on_stack[v] = True
+			path.append(v)
+
+	# Components are found sinks first; number them the other way round.
+	return num_components - 1 - np.array(component, dtype=np.int64)
+
+
+def condensation(G, component=None):
+	"""Return the component graph of a directed graph: one vertex per strongly connected
+	component, and an edge (a, b) if some edge of G goes from component a to component b.
+
+	Arguments:
+	G -- a directed graph (AdjacencyListGraph or CSRGraph)
+	component -- component numbers from tarjan_scc, computed if not given
+
+	Returns:
+	component -- int array of the component of each vertex, as from tarjan_scc
+	dag -- the component graph, an acyclic CSRGraph whose edges each appear once
+	"""
+	if not hasattr(G, "get_arrays"):
+		G = CSRGraph.from_adjacency_list_graph(G)
+	if component is None:
+		component = tarjan_scc(G)
+	num_components = int(component.max()) + 1 if len(component) > 0 else 0
+	offsets, neighbors, _ = G.get_arrays()
+	offsets = np.asarray(offsets, dtype=np.int64)
+	from_component = np.repeat(component, np.diff(offsets))
+	to_component = component[np.asarray(neighbors, dtype=np.int64)]
+	between = from_component != to_component
+	keys = np.unique(from_component[between] * num_components + to_component[between])
+	dag = CSRGraph.from_arrays(num_components, keys // num_components, keys % num_components)
+	return component, dag
+
+
+def component_members(component):
+	"""Return a list whose entry c lists the vertices of component c, in increasing order."""
+	order = np.argsort(component, kind='stable')
+	counts = np.bincount(component)
+	return [members.tolist() for members in np.split(order, np.cumsum(counts)[:-1])] \
+		if len(component) > 0 else []
+
+
 # Testing
 if __name__ == "__main__":
-	import numpy as np 
+	import time
+	from random import randint
 	from adjacency_list_graph import AdjacencyListGraph
 
 	# Directed. 
@@ -94,3 +211,41 @@ if __name__ == "__main__":
 	components = strongly_connected_components(graph2)
 	for component in components:
 		print([vertices[i] for i in component])
+	print(component_members(tarjan_scc(graph2)))
+	print(condensation(graph2)[1].strmap())
+	print()
+
+	# Same components as Kosaraju's algorithm on random graphs, in topological order.
+	all_equal = True
+	for _ in range(30):
+		card_V = randint(1, 60)
+		graph3 = AdjacencyListGraph(card_V)
+		for u in range(card_V):
+			for _ in range(randint(0, 3)):
+				v = randint(0, card_V - 1)
+				if not graph3.has_edge(u, v):
+					graph3.insert_edge(u, v)
+		component, dag = condensation(graph3)
+		expected = sorted(sorted(c) for c in strongly_connected_components(graph3))
+		cross_edges = {(int(component[u]), int(component[v])) for u, v in graph3.get_edge_list()
+					   if component[u] != component[v]}
+		all_equal = all_equal and sorted(component_members(component)) == expected \
+			and set(dag.get_edge_list()) == cross_edges and all(a < b for a, b in cross_edges)
+	print(all_equal)
+
+	# Timetable-sized directed graph, and a long cycle that would need deep recursion.
+	n = 100000
+	graph4 = AdjacencyListGraph(n, True, False, False)
+	for u in range(n):
+		for v in {randint(0, n - 1) for _ in range(2)}:
+			graph4.insert_edge(u, v)
+	start = time.perf_counter()
+	kosaraju = strongly_connected_components(graph4)
+	print(f"Kosaraju with transpose, {n} vertices: {time.perf_counter() - start:.2f}s")
+	start = time.perf_counter()
+	component, dag = condensation(graph4)
+	print(f"Tarjan plus condensation, {n} vertices: {time.perf_counter() - start:.2f}s, "
+		  f"{dag.get_card_V()} components, {dag.get_card_E()} DAG edges")
+	print(sorted(component_members(component)) == sorted(sorted(c) for c in kosaraju))
+	cycle = CSRGraph.from_arrays(10**6, np.arange(10**6), (np.arange(10**6) + 1) % 10**6)
+	print(int(tarjan_scc(cycle).max()) == 0)
@@ -30,14 +30,22 @@
 #                                                                       #
 #########################################################################
 
+import numpy as np
 from dll_sentinel import DLLSentinel
 from dfs import dfs
+from csr_graph import CSRGraph
 
 
-def finish(u):
-	"""Prepend onto the linked list as each vertex is finished."""
-	global ordered_list
-	ordered_list.prepend(u)
+class CycleError(RuntimeError):
+
+	def __init__(self, cycle):
+		"""Error for a graph that is not acyclic.
+
+		Argument:
+		cycle -- list of vertices on a cycle, in edge order, with the first vertex repeated at the end
+		"""
+		super().__init__("Graph has a cycle: " + " -> ".join(str(u) for u in cycle))
+		self.cycle = cycle
 
 
 def topological_sort(G):
@@ -49,14 +57,81 @@ def topological_sort(G):
 	Returns:
 	A linked list giving the topologically sorted order of the vertices.
 	"""
-	global ordered_list
 	if not G.is_directed():
 		raise RuntimeError("Graph must be directed.")
 	ordered_list = DLLSentinel()
-	dfs(G, None, None, finish)  # no start_dfs_tree or discovery_func
+	# Prepend onto the linked list as each vertex is finished.
+	dfs(G, None, None, lambda u: ordered_list.prepend(u))  # no start_dfs_tree or discovery_func
 	return ordered_list
 
 
+def topological_sort_kahn(G):
+	"""Topologically sort a directed acyclic graph by repeatedly removing vertices with
+	no entering edges (Kahn's algorithm), one level at a time.  Level 0 holds the
+	vertices with no entering edges, and level k + 1 the vertices whose last entering
+	edge comes from level k, so level[v] is the number of edges on a longest path
+	ending at v.  Vertices on the same level have no path between them and can be
+	handled in parallel.
+
+	Arguments:
+	G -- a dag (AdjacencyListGraph or CSRGraph)
+
+	Returns:
+	order -- int array of the vertices in topologically sorted order, level by level
+	level -- int array, level[v] is the level of vertex v
+
+	Raises CycleError, whose cycle attribute lists the vertices of a cycle, if G has one.
+	"""
+	if not G.is_directed():
+		raise RuntimeError("Graph must be directed.")
+	if not hasattr(G, "get_arrays"):
+		G = CSRGraph.from_adjacency_list_graph(G)
+	card_V = G.get_card_V()
+	offsets, neighbors, _ = G.get_arrays()
+	in_degree = np.bincount(np.asarray(neighbors, dtype=np.int64), minlength=card_V).tolist()
+	offsets = offsets.tolist()
+	neighbors = neighbors.tolist()
+
+	level = [0] * card_V
+	frontier = [u for u in range(card_V) if in_degree[u] == 0]
+	order = []
+	k = 0
+	while frontier:
+		order.extend(frontier)
+		next_frontier = []
+		for u in frontier:
+			for i in range(offsets[u], offsets[u + 1]):
+				v = neighbors[i]
+				in_degree[v] -= 1
+				if in_degree[v] == 0:
+					level[v] = k + 1
+					next_frontier.append(v)
+		frontier = next_frontier
+		k += 1
+
+	if len(order) < card_V:
+		raise CycleError(_find_cycle(G, in_degree))
+	return np.array(order, dtype=np.int64), np.array(level, dtype=np.int64)
+
+
+def _find_cycle(G, in_degree):
+	"""Return a cycle among the vertices that Kahn's algorithm could not remove.  Each
+	such vertex has an entering edge from another one, so walking backward along those
+	edges must eventually repeat a vertex."""
+	in_offsets, in_neighbors, _ = G.transpose().get_arrays()
+	u = next(u for u in range(G.get_card_V()) if in_degree[u] > 0)
+	position = {}  # position of each vertex on the walk
+	walk = []
+	while u not in position:
+		position[u] = len(walk)
+		walk.append(u)
+		u = next(in_neighbors[i] for i in range(in_offsets[u], in_offsets[u + 1])
+				 if in_degree[in_neighbors[i]] > 0)
+	cycle = walk[position[u]:] + [u]
+	cycle.reverse()  # the walk went against the edges
+	return cycle
+
+
 # Testing
 if __name__ == "__main__":
 
@@ -86,6 +161,28 @@ if __name__ == "__main__":
 		print(clothing[data])
 	print()
 
+	# Kahn's algorithm: the same clothing, dressed level by level.
+	order, level = topological_sort_kahn(graph2)
+	for k in range(int(level.max()) + 1):
+		print(k, [clothing[u] for u in order if level[u] == k])
+	position = {int(u): i for i, u in enumerate(order)}
+	print(all(position[u] < position[v] and level[u] < level[v] for u, v in graph2.get_edge_list()))
+
+	# A cycle is reported.
+	graph2.insert_edge(clothing.index("jacket"), clothing.index("pants"))
+	try:
+		topological_sort_kahn(graph2)
+	except CycleError as e:
+		print([clothing[u] for u in e.cycle])
+	graph4 = AdjacencyListGraph(3)
+	graph4.insert_edge(0, 1)
+	graph4.insert_edge(2, 2)
+	try:
+		topological_sort_kahn(graph4)
+	except CycleError as e:
+		print(e)
+	print()
+
 	# Undirected. 
 	graph3 = AdjacencyListGraph(10, False)
 	graph3.insert_edge(1, 2)
@@ -94,3 +191,40 @@ if __name__ == "__main__":
 		topological_sort(graph3)
 	except RuntimeError as e:
 		print(e)
+	try: 
+		topological_sort_kahn(graph3)
+	except RuntimeError as e:
+		print(e)
+
+	# Random dags, and random graphs with cycles.
+	from random import randint, sample
+	all_valid = True
+	for _ in range(50):
+		card_V = randint(2, 50)
+		graph5 = AdjacencyListGraph(card_V)
+		for _ in range(randint(0, 2 * card_V)):
+			u, v = sorted(sample(range(card_V), 2))
+			if not graph5.has_edge(u, v):
+				graph5.insert_edge(u, v)
+		order, level = topological_sort_kahn(graph5)
+		position = {int(u): i for i, u in enumerate(order)}
+		longest = [0] * card_V
+		for u in range(card_V):  # 0, 1, ... is a topological order here
+			for edge in graph5.get_adj_list(u):
+				longest[edge.get_v()] = max(longest[edge.get_v()], longest[u] + 1)
+		all_valid = all_valid and sorted(position) == list(range(card_V)) \
+			and all(position[u] < position[v] for u, v in graph5.get_edge_list()) \
+			and level.tolist() == longest
+		# Every edge goes from a lower to a higher vertex, so an edge v -> u with u < v
+		# closes a cycle through the edge u -> v.
+		u, v = sorted(sample(range(card_V), 2))
+		if not graph5.has_edge(u, v):
+			graph5.insert_edge(u, v)
+		graph5.insert_edge(v, u)
+		try:
+			topological_sort_kahn(graph5)
+			all_valid = False
+		except CycleError as e:
+			all_valid = all_valid and e.cycle[0] == e.cycle[-1] \
+				and all(graph5.has_edge(e.cycle[i], e.cycle[i + 1]) for i in range(len(e.cycle) - 1))
+	print(all_valid)
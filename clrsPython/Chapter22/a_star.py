@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# a_star.py
+
+# A* search: Dijkstra's algorithm with each vertex v keyed by d[v] + h(v, t), where h
+# is a lower bound on the distance from v to the target t.  The better the bound, the
+# fewer vertices are settled before t.  With h = 0 it is exactly Dijkstra's algorithm.
+#
+# The tube data has no coordinates, so the bound shipped here is the landmark (ALT)
+# bound.  For a landmark L, the triangle inequality gives
+#     dist(v, t) >= dist(L, t) - dist(L, v)   and   dist(v, t) >= dist(v, L) - dist(t, L),
+# so the largest of these over a few landmarks with precomputed Dijkstra trees is an
+# admissible and consistent heuristic.
+
+from heapq import heappush, heappop
+
+import numpy as np
+
+from clrsPython.Chapter22.dijkstra import dijkstra_lazy
+
+
+def zero_heuristic(v, t):
+	"""The trivial lower bound, which makes A* behave like Dijkstra's algorithm."""
+	return 0
+
+
+def a_star(G, s, t, heuristic=zero_heuristic):
+	"""Find a shortest path from s to t in a graph with nonnegative weights.
+
+	Arguments:
+	G -- a weighted graph (AdjacencyListGraph or CSRGraph)
+	s -- index of source vertex
+	t -- index of target vertex
+	heuristic -- function taking (v, t) and returning a lower bound on the weight of
+	a shortest path from v to t.  Must be consistent: heuristic(u, t) <= w(u, v) + heuristic(v, t).
+
+	Returns:
+	dist -- weight of a shortest path from s to t, infinity if t is unreachable
+	path -- list of the vertices on that path from s to t, None if t is unreachable
+	settled -- number of vertices settled before t
+	"""
+	card_V = G.get_card_V()
+	inf = float('inf')
+	d = [inf] * card_V
+	pi = [None] * card_V
+	h = [None] * card_V  # heuristic values, computed once per vertex reached
+	settled = [False] * card_V
+	d[s] = 0
+	h[s] = heuristic(s, t)
+	heap = [(h[s], s)]
+	arrays = G.get_arrays() if hasattr(G, "get_arrays") else None
+	count = 0
+
+	while heap:
+		_, u = heappop(heap)
+		if settled[u]:
+			continue  # out-of-date heap entry
+		settled[u] = True
+		count += 1
+		if u == t:
+			break
+
+		d_u = d[u]
+		if arrays is not None:
+			offsets, neighbors, weights = arrays
+			edges = ((neighbors[i], weights[i]) for i in range(offsets[u], offsets[u + 1]))
+		else:
+			edges = ((edge.v, edge.weight) for edge in G.get_adj_list(u))
+		for v, w in edges:
+			if d_u + w < d[v]:
+				d[v] = d_u + w
+				pi[v] = u
+				if h[v] is None:
+					h[v] = heuristic(v, t)
+				heappush(heap, (d[v] + h[v], v))
+
+	if not settled[t]:
+		return inf, None, count
+	path = []
+	v = t
+	while v is not None:
+		path.append(v)
+		v = pi[v]
+	path.reverse()
+	return d[t], path, count
+
+
+class LandmarkHeuristic:
+
+	def __init__(self, landmarks, from_dist, to_dist):
+		"""Initialize a landmark heuristic from precomputed distances.  Normally built
+		with LandmarkHeuristic.build or LandmarkHeuristic.load.
+
+		Arguments:
+		landmarks -- list of landmark vertices
+		from_dist -- from_dist[i][v] is the distance from landmark i to v
+		to_dist -- to_dist[i][v] is the distance from v to landmark i
+		"""
+		self.landmarks = list(landmarks)
+		self.from_dist = [list(row) for row in from_dist]
+		self.to_dist = [list(row) for row in to_dist]
+
+	@classmethod
+	def build(cls, G, num_landmarks=8, first=0):
+		"""Pick landmarks and run Dijkstra from each.  Landmarks are chosen greedily:
+		each new landmark is the vertex farthest from those already chosen, which puts
+		them at the edges of the network where their bounds are tightest.
+
+		Arguments:
+		G -- a weighted graph with nonnegative weights
+		num_landmarks -- how many landmarks to use
+		first -- the vertex the farthest-first selection starts from
+		"""
+		card_V = G.get_card_V()
+		inf = float('inf')
+		reverse = G.transpose() if G.is_directed() else G
+		landmarks = []
+		from_dist = []
+		to_dist = []
+		# closest[v] is the distance from the nearest landmark so far; start from first.
+		closest = dijkstra_lazy(G, first)[0]
+		for _ in range(min(num_landmarks, card_V)):
+			candidates = [v for v in range(card_V) if closest[v] < inf and v not in landmarks]
+			if not candidates:
+				break
+			L = max(candidates, key=lambda v: closest[v])
+			landmarks.append(L)
+			from_dist.append(dijkstra_lazy(G, L)[0])
+			to_dist.append(dijkstra_lazy(reverse, L)[0] if G.is_directed() else from_dist[-1])
+			closest = [min(closest[v], from_dist[-1][v]) for v in range(card_V)]
+		return cls(landmarks, from_dist, to_dist)
+
+	def __call__(self, v, t):
+		"""Return a lower bound on the distance from v to t."""
+		inf = float('inf')
+		bound = 0
+		for i in range(len(self.landmarks)):
+			from_L = self.from_dist[i]
+			to_L = self.to_dist[i]
+			# Landmarks that cannot reach or be reached from v or t give no bound.
+			if from_L[t] < inf and from_L[v] < inf:
+				bound = max(bound, from_L[t] - from_L[v])
+			if to_L[v] < inf and to_L[t] < inf:
+				bound = max(bound, to_L[v] - to_L[t])
+		return bound
+
+	def save(self, path):
+		"""Save the landmarks and their distance tables to a NumPy .npz file."""
+		np.savez(path, landmarks=np.array(self.landmarks, dtype=np.int64),
+				 from_dist=np.array(self.from_dist, dtype=np.float64),
+				 to_dist=np.array(self.to_dist, dtype=np.float64))
+
+	@classmethod
+	def load(cls, path):
+		"""Load a heuristic saved with save."""
+		with np.load(path) as data:
+			from_dist = [[int(x) if x.is_integer() else x for x in row] for row in data["from_dist"].tolist()]
+			to_dist = [[int(x) if x.is_integer() else x for x in row] for row in data["to_dist"].tolist()]
+			return cls(data["landmarks"].tolist(), from_dist, to_dist)
+
+
+# Testing
+if __name__ == "__main__":
+
+	import os
+	import tempfile
+	from random import randint
+	from clrsPython.Chapter22.dijkstra import dijkstra
+	from clrsPython.UtilityFunctions.adjacency_list_graph import AdjacencyListGraph
+	from clrsPython.UtilityFunctions.generate_random_graph import generate_random_graph
+
+	# Directed random graph: A* with landmarks must match Dijkstra.
+	card_V = 200
+	graph1 = generate_random_graph(card_V, 0.03, True, True, True, 1, 15)
+	alt1 = LandmarkHeuristic.build(graph1, 6)
+	all_equal = True
+	for trial in range(100):
+		s, t = randint(0, card_V - 1), randint(0, card_V - 1)
+		dist, path, settled = a_star(graph1, s, t, alt1)
+		if dist != dijkstra(graph1, s)[0][t]:
+			all_equal = False
+	print("A* distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Grid-like undirected network: compare vertices settled with and without landmarks.
+	rows, cols = 60, 60
+	graph2 = AdjacencyListGraph(rows * cols, False, True)
+	for r in range(rows):
+		for c in range(cols):
+			if c + 1 < cols:
+				graph2.insert_edge(r * cols + c, r * cols + c + 1, randint(2, 6))
+			if r + 1 < rows:
+				graph2.insert_edge(r * cols + c, (r + 1) * cols + c, randint(2, 6))
+	alt2 = LandmarkHeuristic.build(graph2, 8)
+	plain_total = alt_total = 0
+	all_equal = True
+	for trial in range(30):
+		s, t = randint(0, rows * cols - 1), randint(0, rows * cols - 1)
+		plain = a_star(graph2, s, t)
+		alt = a_star(graph2, s, t, alt2)
+		all_equal = all_equal and plain[0] == alt[0]
+		plain_total += plain[2]
+		alt_total += alt[2]
+	print("Distances equal:", all_equal, "settled with landmarks:", alt_total, "without:", plain_total)
+
+	# Save and reload the preprocessing.
+	path = os.path.join(tempfile.mkdtemp(), "landmarks.npz")
+	alt2.save(path)
+	alt3 = LandmarkHeuristic.load(path)
+	print(alt3.landmarks == alt2.landmarks and alt3.from_dist == alt2.from_dist)
+	os.remove(path)
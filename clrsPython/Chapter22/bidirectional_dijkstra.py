@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# bidirectional_dijkstra.py
+
+# Point-to-point shortest paths in an undirected graph by running Dijkstra's algorithm
+# from both ends at once.  The forward search grows a ball around the source and the
+# backward search grows a ball around the target; once the smallest keys in the two
+# queues add up to at least the best path seen where the balls touch, that path is
+# a shortest path.  Two balls of half the radius usually hold far fewer vertices than
+# one ball of the full radius.
+
+from heapq import heappush, heappop
+
+
+def _neighbors(G, u):
+	"""Yield (v, weight) for each edge (u, v) of G, reading a CSR graph's arrays directly."""
+	if hasattr(G, "get_arrays"):
+		offsets, neighbors, weights = G.get_arrays()
+		for i in range(offsets[u], offsets[u + 1]):
+			yield neighbors[i], weights[i]
+	else:
+		for edge in G.get_adj_list(u):
+			yield edge.v, edge.weight
+
+
+def _walk_back(pi, v):
+	"""Return the list of vertices from the root of the predecessor tree pi to v."""
+	path = []
+	while v is not None:
+		path.append(v)
+		v = pi[v]
+	path.reverse()
+	return path
+
+
+def bidirectional_dijkstra(G, s, t):
+	"""Find a shortest path from s to t in an undirected graph with nonnegative weights.
+
+	Arguments:
+	G -- an undirected, weighted graph (AdjacencyListGraph or CSRGraph)
+	s -- index of source vertex
+	t -- index of target vertex
+
+	Returns:
+	dist -- weight of a shortest path from s to t, infinity if t is unreachable
+	path -- list of the vertices on that path from s to t, None if t is unreachable
+	settled -- number of vertices settled by the two searches together
+	"""
+	if G.is_directed():
+		raise RuntimeError("Graph should be undirected.")
+	if s == t:
+		return 0, [s], 1
+
+	card_V = G.get_card_V()
+	inf = float('inf')
+	d = ([inf] * card_V, [inf] * card_V)         # d[0] forward from s, d[1] backward from t
+	pi = ([None] * card_V, [None] * card_V)
+	done = ([False] * card_V, [False] * card_V)
+	heaps = ([(0, s)], [(0, t)])
+	d[0][s] = 0
+	d[1][t] = 0
+
+	mu = inf       # weight of the best s-t path seen so far
+	meet = None    # (x, y): that path is s ~> x, edge (x, y), y ~> t
+	settled = 0
+
+	while heaps[0] and heaps[1]:
+		# Standard stopping criterion: no path through unsettled vertices can beat mu.
+		if heaps[0][0][0] + heaps[1][0][0] >= mu:
+			break
+
+		# Advance the search whose next vertex is closer.
+		side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+		d_side, d_other = d[side], d[1 - side]
+		d_u, u = heappop(heaps[side])
+		if done[side][u]:
+			continue  # out-of-date heap entry
+		done[side][u] = True
+		settled += 1
+
+		for v, w in _neighbors(G, u):
+			d_v = d_u + w
+			if d_v < d_side[v]:
+				d_side[v] = d_v
+				pi[side][v] = u
+				heappush(heaps[side], (d_v, v))
+			# Does edge (u, v) join the two searches into a better path?
+			if d_u + w + d_other[v] < mu:
+				mu = d_u + w + d_other[v]
+				meet = (u, v) if side == 0 else (v, u)
+
+	if meet is None:
+		return inf, None, settled
+	x, y = meet
+	path = _walk_back(pi[0], x) + _walk_back(pi[1], y)[::-1]
+	return mu, path, settled
+
+
+# Testing
+if __name__ == "__main__":
+
+	from clrsPython.UtilityFunctions.adjacency_list_graph import AdjacencyListGraph
+	from clrsPython.UtilityFunctions.csr_graph import CSRGraph
+	from clrsPython.UtilityFunctions.generate_random_graph import generate_random_graph
+	from clrsPython.Chapter22.dijkstra import dijkstra, dijkstra_lazy
+	from random import randint
+
+	# Textbook MST example, treated as a road map.
+	vertices = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i']
+	edges = [('a', 'b', 4), ('a', 'h', 8), ('b', 'c', 8), ('b', 'h', 11), ('c', 'd', 7),
+			 ('c', 'f', 4), ('c', 'i', 2), ('d', 'e', 9), ('d', 'f', 14), ('e', 'f', 10),
+			 ('f', 'g', 2), ('g', 'h', 1), ('g', 'i', 6), ('h', 'i', 7)]
+	graph1 = AdjacencyListGraph(len(vertices), False, True)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+	dist, path, settled = bidirectional_dijkstra(graph1, vertices.index('a'), vertices.index('e'))
+	print(dist, [vertices[i] for i in path], settled)  # should be 21, a h g f c d e or a h g f e
+	print()
+
+	# Distances and path weights should agree with Dijkstra on random graphs.
+	card_V = 300
+	graph2 = generate_random_graph(card_V, 0.02, True, False, True, 1, 15)
+	csr2 = CSRGraph.from_adjacency_list_graph(graph2)
+	all_equal = True
+	for trial in range(100):
+		s, t = randint(0, card_V - 1), randint(0, card_V - 1)
+		d = dijkstra(graph2, s)[0]
+		for G in (graph2, csr2):
+			dist, path, settled = bidirectional_dijkstra(G, s, t)
+			if dist != d[t]:
+				all_equal = False
+			if path is not None:
+				weight = sum(graph2.find_edge(path[i], path[i + 1]).get_weight() for i in range(len(path) - 1))
+				if path[0] != s or path[-1] != t or weight != dist:
+					all_equal = False
+	print("Bidirectional distances are " + ("not " if not all_equal else "") + "equal")
+
+	# On a grid-like network, compare settled vertices with one-directional Dijkstra
+	# stopping at the target.
+	rows, cols = 80, 80
+	graph3 = AdjacencyListGraph(rows * cols, False, True)
+	for r in range(rows):
+		for c in range(cols):
+			if c + 1 < cols:
+				graph3.insert_edge(r * cols + c, r * cols + c + 1, randint(2, 6))
+			if r + 1 < rows:
+				graph3.insert_edge(r * cols + c, (r + 1) * cols + c, randint(2, 6))
+	s, t = 40 * cols + 10, 40 * cols + 70
+	d, pi = dijkstra_lazy(graph3, s, t)
+	one_way = sum(1 for v in range(rows * cols) if d[v] <= d[t])
+	dist, path, settled = bidirectional_dijkstra(graph3, s, t)
+	print(dist == d[t], "settled:", settled, "bidirectional vs about", one_way, "one-directional")
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# contraction_hierarchy.py
+
+# Contraction hierarchies for many point-to-point queries on a static undirected graph.
+#
+# Preprocessing contracts the vertices one at a time, least important first.  Removing
+# a vertex v would break shortest paths u -> v -> w between its remaining neighbors, so
+# a shortcut edge (u, w) of weight w(u, v) + w(v, w) is added unless a local "witness"
+# search finds a path at least as short that avoids v.  The order in which vertices are
+# contracted is their rank.  Every shortest path in the original graph then has a
+# counterpart in the augmented graph that first climbs to higher and higher ranks and
+# then descends, so a query only needs a bidirectional Dijkstra search over edges that
+# lead upward.  Shortcuts remember the vertex they bypass so that paths can be unpacked
+# back into original edges.
+
+import json
+import time
+from heapq import heappush, heappop
+
+import numpy as np
+
+
+class ContractionHierarchy:
+
+	def __init__(self, rank, up, middle, stats=None):
+		"""Initialize a contraction hierarchy from its parts.  Normally built with
+		ContractionHierarchy.build or ContractionHierarchy.load.
+
+		Arguments:
+		rank -- rank[v] is the position of v in the contraction order
+		up -- up[u] is a list of (v, weight) for the edges of the augmented graph from u
+		to a vertex v of higher rank
+		middle -- dictionary mapping (min(u, w), max(u, w)) to the vertex bypassed by
+		the shortcut (u, w); original edges do not appear
+		stats -- optional dictionary of preprocessing statistics
+		"""
+		self.rank = rank
+		self.up = up
+		self.middle = middle
+		self.stats = stats if stats is not None else {}
+
+	@classmethod
+	def build(cls, G, witness_limit=60):
+		"""Contract every vertex of G and return the resulting hierarchy.
+
+		Arguments:
+		G -- an undirected graph with nonnegative weights (AdjacencyListGraph or CSRGraph)
+		witness_limit -- maximum number of vertices a witness search may settle before
+		giving up.  Giving up early only adds shortcuts that were not needed; it never
+		makes queries wrong.
+		"""
+		if G.is_directed():
+			raise RuntimeError("Graph should be undirected.")
+		start = time.perf_counter()
+		card_V = G.get_card_V()
+
+		# The remaining (not yet contracted) graph, as one dictionary per vertex.
+		adj = [dict() for _ in range(card_V)]
+		for u in range(card_V):
+			for edge in G.get_adj_list(u):
+				v, w = edge.get_v(), edge.get_weight()
+				if u != v and (v not in adj[u] or w < adj[u][v]):
+					adj[u][v] = w
+		original_edges = sum(len(a) for a in adj) // 2
+
+		contracted = [False] * card_V
+		contracted_neighbors = [0] * card_V
+		rank = [None] * card_V
+		up = [[] for _ in range(card_V)]
+		middle = {}
+		num_shortcuts = 0
+
+		def witness_distances(u, v, limit):
+			"""Dijkstra from u in the remaining graph without v, stopping past limit."""
+			dist = {u: 0}
+			heap = [(0, u)]
+			done = set()
+			while heap and len(done) < witness_limit:
+				d_x, x = heappop(heap)
+				if x in done:
+					continue
+				if d_x > limit:
+					break
+				done.add(x)
+				for y, w in adj[x].items():
+					if y != v and d_x + w < dist.get(y, float('inf')):
+						dist[y] = d_x + w
+						heappush(heap, (d_x + w, y))
+			return dist
+
+		def shortcuts_needed(v):
+			"""Return the shortcuts (u, w, weight) that contracting v would add."""
+			neighbors = list(adj[v].items())
+			if len(neighbors) < 2:
+				return []
+			max_out = max(w for _, w in neighbors)
+			shortcuts = []
+			for i, (u, w_uv) in enumerate(neighbors):
+				dist = witness_distances(u, v, w_uv + max_out)
+				for x, w_vx in neighbors[i + 1:]:
+					through_v = w_uv + w_vx
+					if dist.get(x, float('inf')) > through_v:
+						shortcuts.append((u, x, through_v))
+			return shortcuts
+
+		def priority(v):
+			"""Edge difference plus the number of already-contracted neighbors."""
+			return len(shortcuts_needed(v)) - len(adj[v]) + contracted_neighbors[v]
+
+		queue = [(priority(v), v) for v in range(card_V)]
+		queue.sort()
+		next_rank = 0
+		while queue:
+			_, v = heappop(queue)
+			if contracted[v]:
+				continue
+			# Lazy update: the priority may be stale, so recompute it before contracting.
+			p = priority(v)
+			if queue and p > queue[0][0]:
+				heappush(queue, (p, v))
+				continue
+
+			for u, x, weight in shortcuts_needed(v):
+				if weight < adj[u].get(x, float('inf')):
+					adj[u][x] = weight
+					adj[x][u] = weight
+					middle[(min(u, x), max(u, x))] = v
+					num_shortcuts += 1
+
+			# All remaining neighbors will get higher ranks, so v's edges lead upward.
+			for u, w in adj[v].items():
+				up[v].append((u, w))
+				del adj[u][v]
+				contracted_neighbors[u] += 1
+			adj[v] = {}
+			contracted[v] = True
+			rank[v] = next_rank
+			next_rank += 1
+
+		stats = {
+			"vertices": card_V,
+			"original_edges": original_edges,
+			"shortcuts": num_shortcuts,
+			"upward_edges": sum(len(a) for a in up),
+			"preprocessing_seconds": time.perf_counter() - start,
+		}
+		return cls(rank, up, middle, stats)
+
+	def query(self, s, t):
+		"""Find a shortest path from s to t.
+
+		Returns:
+		dist -- weight of a shortest path from s to t, infinity if t is unreachable
+		path -- list of the original-graph vertices on that path, None if t is unreachable
+		settled -- number of vertices settled by the two upward searches together
+		"""
+		if s == t:
+			return 0, [s], 1
+		inf = float('inf')
+		d = ({s: 0}, {t: 0})
+		pi = ({s: None}, {t: None})
+		done = (set(), set())
+		heaps = ([(0, s)], [(0, t)])
+		mu = inf
+		meet = None
+		settled = 0
+
+		side = 0
+		while (heaps[0] and heaps[0][0][0] < mu) or (heaps[1] and heaps[1][0][0] < mu):
+			# Alternate between the searches, skipping one that can no longer improve mu.
+			if not heaps[side] or heaps[side][0][0] >= mu:
+				side = 1 - side
+			d_u, u = heappop(heaps[side])
+			if u in done[side]:
+				continue
+			done[side].add(u)
+			settled += 1
+			if u in d[1 - side] and d_u + d[1 - side][u] < mu:
+				mu = d_u + d[1 - side][u]
+				meet = u
+			for v, w in self.up[u]:
+				if d_u + w < d[side].get(v, inf):
+					d[side][v] = d_u + w
+					pi[side][v] = u
+					heappush(heaps[side], (d_u + w, v))
+			side = 1 - side
+
+		if meet is None:
+			return inf, None, settled
+
+		# Upward path s ~> meet, then downward path meet ~> t, in augmented-graph edges.
+		path = []
+		v = meet
+		while v is not None:
+			path.append(v)
+			v = pi[0][v]
+		path.reverse()
+		v = pi[1][meet]
+		while v is not None:
+			path.append(v)
+			v = pi[1][v]
+		return mu, self.unpack(path), settled
+
+	def unpack(self, path):
+		"""Replace every shortcut on a path by the original edges it stands for."""
+		result = [path[0]]
+		for i in range(len(path) - 1):
+			stack = [(path[i], path[i + 1])]
+			while stack:
+				u, w = stack.pop()
+				v = self.middle.get((min(u, w), max(u, w)))
+				if v is None:
+					result.append(w)  # an original edge
+				else:
+					stack.append((v, w))  # handled second
+					stack.append((u, v))  # handled first
+		return result
+
+	def save(self, path):
+		"""Save the hierarchy, with its preprocessing statistics, to a NumPy .npz file."""
+		card_V = len(self.rank)
+		offsets = np.zeros(card_V + 1, dtype=np.int64)
+		for u in range(card_V):
+			offsets[u + 1] = offsets[u] + len(self.up[u])
+		targets = np.array([v for u in range(card_V) for v, _ in self.up[u]], dtype=np.int64)
+		weights = np.array([w for u in range(card_V) for _, w in self.up[u]], dtype=np.float64)
+		keys = np.array(list(self.middle.keys()), dtype=np.int64).reshape(-1, 2)
+		middles = np.array(list(self.middle.values()), dtype=np.int64)
+		np.savez(path, rank=np.array(self.rank, dtype=np.int64), offsets=offsets, targets=targets,
+				 weights=weights, middle_keys=keys, middles=middles, stats=np.array(json.dumps(self.stats)))
+
+	@classmethod
+	def load(cls, path):
+		"""Load a hierarchy saved with save."""
+		with np.load(path) as data:
+			rank = data["rank"].tolist()
+			offsets = data["offsets"].tolist()
+			targets = data["targets"].tolist()
+			weights = [int(w) if w.is_integer() else w for w in data["weights"].tolist()]
+			up = [list(zip(targets[offsets[u]:offsets[u + 1]], weights[offsets[u]:offsets[u + 1]]))
+				  for u in range(len(rank))]
+			middle = {(a, b): m for (a, b), m in zip(data["middle_keys"].tolist(), data["middles"].tolist())}
+			stats = json.loads(data["stats"].item()) if "stats" in data.files else {}
+		return cls(rank, up, middle, stats)
+
+
+# Testing
+if __name__ == "__main__":
+
+	import os
+	import tempfile
+	from random import randint
+	from clrsPython.Chapter22.dijkstra import dijkstra
+	from clrsPython.UtilityFunctions.adjacency_list_graph import AdjacencyListGraph
+	from clrsPython.UtilityFunctions.generate_random_graph import generate_random_graph
+
+	def check(G, ch, queries):
+		"""Compare query distances with Dijkstra and check that unpacked paths are real paths."""
+		card_V = G.get_card_V()
+		all_equal = True
+		total_settled = 0
+		for _ in range(queries):
+			s, t = randint(0, card_V - 1), randint(0, card_V - 1)
+			dist, path, settled = ch.query(s, t)
+			total_settled += settled
+			if dist != dijkstra(G, s)[0][t]:
+				all_equal = False
+			elif path is not None:
+				if path[0] != s or path[-1] != t:
+					all_equal = False
+				elif sum(G.find_edge(path[i], path[i + 1]).get_weight() for i in range(len(path) - 1)) != dist:
+					all_equal = False
+		return all_equal, total_settled / queries
+
+	# Random graph.
+	graph1 = generate_random_graph(300, 0.015, True, False, True, 1, 15)
+	ch1 = ContractionHierarchy.build(graph1)
+	print(ch1.stats)
+	print("Random graph matches Dijkstra, average settled:", check(graph1, ch1, 100))
+
+	# Large generated tube-like network: lines joined at random interchanges.
+	num_lines, per_line = 40, 100
+	graph2 = AdjacencyListGraph(num_lines * per_line, False, True)
+	for line in range(num_lines):
+		for i in range(per_line - 1):
+			graph2.insert_edge(line * per_line + i, line * per_line + i + 1, randint(2, 6))
+		for _ in range(4):
+			u = line * per_line + randint(0, per_line - 1)
+			v = randint(0, num_lines * per_line - 1)
+			if u != v and not graph2.has_edge(u, v):
+				graph2.insert_edge(u, v, randint(2, 6))
+	ch2 = ContractionHierarchy.build(graph2)
+	print(ch2.stats)
+	print("Generated network matches Dijkstra, average settled:", check(graph2, ch2, 50))
+
+	# London Underground data, if run from the project root.
+	try:
+		from utils.data_api import init_index, build_graph
+		init_index()
+		graph3, _ = build_graph()
+		ch3 = ContractionHierarchy.build(graph3)
+		print(ch3.stats)
+		print("London network matches Dijkstra, average settled:", check(graph3, ch3, 200))
+	except ImportError:
+		pass
+
+	# Save and reload.
+	path = os.path.join(tempfile.mkdtemp(), "hierarchy.npz")
+	ch2.save(path)
+	ch4 = ContractionHierarchy.load(path)
+	print("Reloaded hierarchy matches Dijkstra:", check(graph2, ch4, 20)[0], ch4.stats == ch2.stats)
+	os.remove(path)
@@ -31,7 +31,7 @@
 #########################################################################
 
 from clrsPython.Chapter22.single_source_shortest_paths import initialize_single_source, relax
-from clrsPython.Chapter20.topological_sort import topological_sort
+from clrsPython.Chapter20.topological_sort import topological_sort_kahn
 
 
 def dag_shortest_paths(G, s):
@@ -44,11 +44,11 @@ def dag_shortest_paths(G, s):
 	d -- distances from source s
 	pi -- predecessors
 	"""
-	# Impose linear ordering on the vertices. 
-	ordered = topological_sort(G)
+	# Impose linear ordering on the vertices.  Raises CycleError if G has a cycle.
+	ordered = topological_sort_kahn(G)[0].tolist()
 	d, pi = initialize_single_source(G, s)
 	# Make one pass through vertices in topologically sorted order. 
-	for u in ordered.iterator():
+	for u in ordered:
 		for edge in G.get_adj_list(u):
 			# Relax each edge that leaves vertex u.
 			relax(u, edge.get_v(), edge.get_weight(), d, pi)
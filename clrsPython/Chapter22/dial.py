@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# dial.py
+
+# Dial's algorithm: Dijkstra's algorithm with a bucket queue in place of a comparison
+# heap, for graphs whose weights are small nonnegative integers.  With every weight at
+# most C, all tentative distances in the queue lie in [d, d + C] for the current
+# distance d, so C + 1 buckets used circularly are enough.  Extracting the minimum is
+# just moving to the next nonempty bucket, and the running time is O(E + D) for a
+# largest distance D, with no log factor.
+
+from clrsPython.Chapter22.single_source_shortest_paths import initialize_single_source
+from clrsPython.Chapter22.dijkstra import dijkstra_lazy
+
+
+def _edges(G, u):
+	"""Yield (v, weight) for each edge (u, v) of G, reading a CSR graph's arrays directly."""
+	if hasattr(G, "get_arrays"):
+		offsets, neighbors, weights = G.get_arrays()
+		for i in range(offsets[u], offsets[u + 1]):
+			yield neighbors[i], weights[i]
+	else:
+		for edge in G.get_adj_list(u):
+			yield edge.v, edge.weight
+
+
+def integer_weight_bound(G):
+	"""Return the largest edge weight of G if every weight is a nonnegative integer
+	(or a float with an integer value), and None otherwise."""
+	bound = 0
+	for u in range(G.get_card_V()):
+		for _, w in _edges(G, u):
+			if w < 0 or w != int(w):
+				return None
+			if w > bound:
+				bound = w
+	return int(bound)
+
+
+def dial(G, s, max_weight):
+	"""Solve single-source shortest-paths problem when every weight is an integer
+	in 0..max_weight.
+
+	Arguments:
+	G -- a directed, weighted graph (AdjacencyListGraph or CSRGraph)
+	s -- index of source vertex
+	max_weight -- an upper bound on the edge weights
+
+	Returns:
+	d -- distances from source vertex s
+	pi -- predecessors
+	"""
+	card_V = G.get_card_V()
+	d, pi = initialize_single_source(G, s)
+	settled = [False] * card_V
+	num_buckets = max_weight + 1
+	buckets = [[] for _ in range(num_buckets)]  # buckets[i] holds vertices with d[v] % num_buckets == i
+	buckets[0].append(s)
+	pending = 1  # entries in all buckets, including out-of-date ones
+	current = 0  # distance of the bucket being emptied
+	arrays = G.get_arrays() if hasattr(G, "get_arrays") else None
+
+	while pending > 0:
+		bucket = buckets[current % num_buckets]
+		while bucket:
+			u = bucket.pop()
+			pending -= 1
+			if settled[u]:
+				continue  # out-of-date entry; u was settled at a smaller distance
+			settled[u] = True
+			d_u = d[u]
+			if arrays is not None:
+				offsets, neighbors, weights = arrays
+				edges = zip(neighbors[offsets[u]:offsets[u + 1]], weights[offsets[u]:offsets[u + 1]])
+			else:
+				edges = ((edge.v, edge.weight) for edge in G.get_adj_list(u))
+			for v, w in edges:
+				d_v = d_u + w
+				if d_v < d[v]:
+					d[v] = d_v
+					pi[v] = u
+					buckets[int(d_v) % num_buckets].append(v)
+					pending += 1
+		current += 1
+
+	return d, pi
+
+
+def shortest_paths(G, s, max_weight=None, bucket_limit=1 << 16):
+	"""Solve single-source shortest-paths problem with no negative-weight edges, using
+	Dial's algorithm when the weights are small integers and the heap-based Dijkstra's
+	algorithm otherwise.  Returns (d, pi) like dijkstra.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	max_weight -- the largest edge weight if already known, so that G need not be scanned
+	bucket_limit -- use buckets only if the largest weight is below this
+	"""
+	if max_weight is None:
+		max_weight = integer_weight_bound(G)
+	if max_weight is not None and max_weight < bucket_limit:
+		return dial(G, s, max_weight)
+	return dijkstra_lazy(G, s)
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from random import randint
+	from clrsPython.Chapter22.dijkstra import dijkstra
+	from clrsPython.UtilityFunctions.adjacency_list_graph import AdjacencyListGraph
+	from clrsPython.UtilityFunctions.csr_graph import CSRGraph
+	from clrsPython.UtilityFunctions.generate_random_graph import generate_random_graph
+
+	# Textbook example.
+	vertices = ['s', 't', 'x', 'y', 'z']
+	edges = [('s', 't', 10), ('s', 'y', 5), ('t', 'x', 1), ('t', 'y', 2), ('x', 'z', 4),
+			('y', 't', 3), ('y', 'x', 9), ('y', 'z', 2), ('z', 's', 7), ('z', 'x', 6)]
+	graph1 = AdjacencyListGraph(len(vertices), True, True)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+	print(shortest_paths(graph1, 0) == dijkstra(graph1, 0))
+
+	# Same distances as Dijkstra on random integer-weighted graphs, including 0 weights,
+	# and the fallback for fractional weights.
+	card_V = 200
+	graph2 = generate_random_graph(card_V, 0.03, True, True, True, 0, 10)
+	print(all(shortest_paths(graph2, s)[0] == dijkstra(graph2, s)[0] for s in range(card_V)))
+	graph3 = AdjacencyListGraph(3, True, True)
+	graph3.insert_edge(0, 1, 0.5)
+	graph3.insert_edge(1, 2, 1.25)
+	print(integer_weight_bound(graph3), shortest_paths(graph3, 0)[0])
+
+	# Benchmark on a tube-like network: lines of stations 1-10 minutes apart, with
+	# random interchanges.
+	num_lines, per_line = 100, 200
+	card_V = num_lines * per_line
+	edge_list = []
+	for line in range(num_lines):
+		for i in range(per_line - 1):
+			edge_list.append((line * per_line + i, line * per_line + i + 1, randint(1, 10)))
+		for _ in range(20):
+			u, v = line * per_line + randint(0, per_line - 1), randint(0, card_V - 1)
+			if u != v:
+				edge_list.append((u, v, randint(1, 10)))
+	us, vs, ws = zip(*edge_list)
+	graph4 = AdjacencyListGraph.from_edges(card_V, us, vs, ws, False, True)
+	csr4 = CSRGraph.from_adjacency_list_graph(graph4)
+	bound = integer_weight_bound(csr4)
+	sources = [randint(0, card_V - 1) for _ in range(5)]
+	for name, func in (("dijkstra", lambda G, s: dijkstra(G, s)),
+					   ("dijkstra_lazy", lambda G, s: dijkstra_lazy(G, s)),
+					   ("dial", lambda G, s: dial(G, s, bound))):
+		for G in (graph4, csr4):
+			start = time.perf_counter()
+			results = [func(G, s)[0] for s in sources]
+			elapsed = (time.perf_counter() - start) / len(sources)
+			print(f"{name:14s} {type(G).__name__:18s} {elapsed * 1000:8.1f} ms per source")
+	print(all(dial(csr4, s, bound)[0] == dijkstra_lazy(csr4, s)[0] for s in sources))
@@ -30,6 +30,7 @@
 #                                                                       #
 #########################################################################
 
+from heapq import heappush, heappop
 from clrsPython.Chapter22.single_source_shortest_paths import initialize_single_source, relax
 from clrsPython.Chapter6.min_heap_priority_queue import MinHeapPriorityQueue
 
@@ -70,6 +71,64 @@ def dijkstra(G, s):
 	return d, pi
 
 
+def dijkstra_lazy(G, s, target=None):
+	"""Solve single-source shortest-paths problem with no negative-weight edges, using
+	an array-based binary heap (heapq) with lazy deletion instead of decrease_key.
+
+	A vertex enters the heap only when it is first reached, and each successful
+	relaxation pushes another (distance, vertex) entry rather than moving the old
+	one.  Entries that are out of date when popped are skipped.  Vertices that are
+	never reached are never touched.  If a target is given, the search stops as soon
+	as the target is settled.
+
+	Arguments:
+	G -- a directed, weighted graph (AdjacencyListGraph or CSRGraph)
+	s -- index of source vertex
+	target -- optional index of a target vertex
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	d -- distances from source vertex s.  With a target, d[target] and the distances of
+	vertices settled before it are final; others are upper bounds or infinity.
+	pi -- predecessors
+	"""
+	d, pi = initialize_single_source(G, s)
+	settled = [False] * G.get_card_V()
+	heap = [(0, s)]
+
+	# A CSR graph exposes its arrays, so relax straight from them.
+	arrays = G.get_arrays() if hasattr(G, "get_arrays") else None
+
+	while heap:
+		d_u, u = heappop(heap)
+		if settled[u]:
+			continue  # out-of-date entry for a vertex already settled
+		settled[u] = True
+		if u == target:
+			break
+
+		if arrays is not None:
+			offsets, neighbors, weights = arrays
+			for i in range(offsets[u], offsets[u + 1]):
+				v = neighbors[i]
+				d_v = d_u + weights[i]
+				if d_v < d[v]:
+					d[v] = d_v
+					pi[v] = u
+					heappush(heap, (d_v, v))
+		else:
+			for edge in G.get_adj_list(u):
+				v = edge.v
+				d_v = d_u + edge.weight
+				if d_v < d[v]:
+					d[v] = d_v
+					pi[v] = u
+					heappush(heap, (d_v, v))
+
+	return d, pi
+
+
 # Testing
 if __name__ == "__main__":
 
@@ -102,4 +161,18 @@ if __name__ == "__main__":
 			print("Shortest-path distances mismatch for source vertex", s)
 			all_equal = False
 		# Don't check whether pi values are equal because shortest paths might not be unique.
-	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
\ No newline at end of file
+	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
+
+	# The lazy-deletion version should agree with the textbook version, on both graph
+	# representations, and the early exit should give the same distance to the target.
+	from clrsPython.UtilityFunctions.csr_graph import CSRGraph
+	csr2 = CSRGraph.from_adjacency_list_graph(graph2)
+	all_equal = True
+	for s in range(card_V):
+		d = dijkstra(graph2, s)[0]
+		if dijkstra_lazy(graph2, s)[0] != d or dijkstra_lazy(csr2, s)[0] != d:
+			all_equal = False
+		t = (s * 7) % card_V
+		if dijkstra_lazy(graph2, s, t)[0][t] != d[t]:
+			all_equal = False
+	print("Lazy Dijkstra distances are " + ("not " if not all_equal else "") + "equal")
\ No newline at end of file
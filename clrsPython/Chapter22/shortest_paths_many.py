@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# shortest_paths_many.py
+
+# Batched shortest paths: Dijkstra's algorithm from many sources at once, with the
+# results gathered into NumPy matrices.  The graph is converted to CSR arrays once and
+# shared by every search, and each search stops as soon as all the requested targets
+# are settled.  Sources can be spread over several processes; each worker receives the
+# compact arrays once, when it starts, rather than once per source.
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappop
+
+import numpy as np
+
+from clrsPython.UtilityFunctions.csr_graph import CSRGraph
+
+
+def _search(card_V, offsets, neighbors, weights, s, targets):
+	"""Dijkstra from s on CSR arrays, stopping once every vertex in targets is settled.
+	targets is a set of vertices, or None for all of them.  Returns (d, pi) lists."""
+	inf = float('inf')
+	d = [inf] * card_V
+	pi = [None] * card_V
+	settled = [False] * card_V
+	remaining = len(targets) if targets is not None else card_V
+	d[s] = 0
+	heap = [(0, s)]
+	while heap and remaining > 0:
+		d_u, u = heappop(heap)
+		if settled[u]:
+			continue  # out-of-date heap entry
+		settled[u] = True
+		if targets is None or u in targets:
+			remaining -= 1
+		for i in range(offsets[u], offsets[u + 1]):
+			v = neighbors[i]
+			d_v = d_u + (weights[i] if weights is not None else 1)
+			if d_v < d[v]:
+				d[v] = d_v
+				pi[v] = u
+				heappush(heap, (d_v, v))
+	return d, pi
+
+
+def _search_rows(graph, sources, targets, predecessors):
+	"""Run _search from each source and return the (D, Pi) rows for the targets."""
+	card_V, offsets, neighbors, weights = graph
+	columns = targets if targets is not None else range(card_V)
+	target_set = set(targets) if targets is not None else None
+	D = np.full((len(sources), len(columns)), np.inf)
+	Pi = np.full((len(sources), len(columns)), -1, dtype=np.int64) if predecessors else None
+	for row, s in enumerate(sources):
+		d, pi = _search(card_V, offsets, neighbors, weights, s, target_set)
+		D[row] = [d[t] for t in columns]
+		if predecessors:
+			Pi[row] = [-1 if pi[t] is None else pi[t] for t in columns]
+	return D, Pi
+
+
+_worker_graph = None  # the CSR arrays, set once in each worker process
+
+
+def _init_worker(graph):
+	global _worker_graph
+	_worker_graph = graph
+
+
+def _worker_rows(sources, targets, predecessors):
+	return _search_rows(_worker_graph, sources, targets, predecessors)
+
+
+def _worker_rows_to_file(filename, dtype, shape, offset, rows, sources, targets):
+	"""Write the distance rows for sources straight into rows of a memory-mapped matrix
+	that starts offset bytes into the file."""
+	out = np.memmap(filename, dtype=dtype, mode='r+', shape=shape, offset=offset)
+	out[rows] = _search_rows(_worker_graph, sources, targets, False)[0]
+	out.flush()
+
+
+def shortest_paths_many(G, sources, targets=None, predecessors=False, workers=None, out=None):
+	"""Solve the shortest-paths problem from each of several sources, with no
+	negative-weight edges.
+
+	Arguments:
+	G -- a weighted graph (AdjacencyListGraph or CSRGraph); unweighted edges count 1
+	sources -- list of source vertices, one row of the result each
+	targets -- list of target vertices, one column of the result each; None for all vertices
+	predecessors -- whether to return the predecessor matrix too
+	workers -- number of processes to spread the sources over; None or 1 to run here
+	out -- optional array of shape (len(sources), len(targets)) to hold D.  If it is a
+	whole np.memmap (not a slice of one), worker processes write their rows into the
+	file directly instead of sending them back.
+
+	Returns:
+	D -- float array, D[i, j] is the distance from sources[i] to targets[j] (inf if unreachable)
+	Pi -- int array, Pi[i, j] is the predecessor of targets[j] on a shortest path from
+	sources[i] (-1 for none); only if predecessors is True
+	"""
+	if not hasattr(G, "get_arrays"):
+		G = CSRGraph.from_adjacency_list_graph(G)
+	offsets, neighbors, weights = G.get_arrays()
+	# Plain lists index faster than arrays in the inner loop, and pickle compactly enough.
+	graph = (G.get_card_V(), offsets.tolist(), neighbors.tolist(),
+			 weights.tolist() if weights is not None else None)
+	sources = list(sources)
+	targets = list(targets) if targets is not None else None
+
+	if workers is None or workers <= 1 or len(sources) < 2:
+		D, Pi = _search_rows(graph, sources, targets, predecessors)
+		if out is not None:
+			out[:] = D
+			D = out
+	else:
+		# A few chunks per worker keeps them all busy when searches differ in cost.
+		num_chunks = min(len(sources), workers * 4)
+		chunks = [sources[i::num_chunks] for i in range(num_chunks)]
+		num_columns = len(targets) if targets is not None else graph[0]
+		D = out if out is not None else np.empty((len(sources), num_columns))
+		Pi = np.empty((len(sources), num_columns), dtype=np.int64) if predecessors else None
+		# Workers can reopen the file only if D is a whole memmap, not a view into one, so
+		# that its filename and offset say where its rows are.
+		to_file = (isinstance(D, np.memmap) and isinstance(D.base, mmap.mmap)
+				   and D.flags.c_contiguous and not predecessors)
+		if to_file:
+			D.flush()
+		with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+								 initargs=(graph,)) as executor:
+			if to_file:
+				futures = [executor.submit(_worker_rows_to_file, D.filename, D.dtype, D.shape, D.offset,
+										   range(i, len(sources), num_chunks), chunk, targets)
+						   for i, chunk in enumerate(chunks)]
+			else:
+				futures = [executor.submit(_worker_rows, chunk, targets, predecessors) for chunk in chunks]
+			for i, future in enumerate(futures):
+				if to_file:
+					future.result()  # raise any error from the worker
+					continue
+				D_chunk, Pi_chunk = future.result()
+				D[i::num_chunks] = D_chunk
+				if predecessors:
+					Pi[i::num_chunks] = Pi_chunk
+	return (D, Pi) if predecessors else D
+
+
+def matrix_path(Pi, row, source, target):
+	"""Return the list of vertices on the path from source to target recorded in row
+	row of a full predecessor matrix (targets=None), or None if target is unreachable."""
+	path = [target]
+	while path[-1] != source:
+		prev = Pi[row, path[-1]]
+		if prev < 0:
+			return None
+		path.append(int(prev))
+	path.reverse()
+	return path
+
+
+# Testing
+if __name__ == "__main__":
+
+	import shutil
+	import tempfile
+	import time
+	from random import randint, sample
+	from clrsPython.Chapter22.dijkstra import dijkstra, dijkstra_lazy
+	from clrsPython.UtilityFunctions.generate_random_graph import generate_random_graph
+
+	# Same distances as Dijkstra, with and without targets and worker processes.
+	card_V = 300
+	graph1 = generate_random_graph(card_V, 0.02, True, True, True, 1, 15)
+	sources = sample(range(card_V), 40)
+	targets = sample(range(card_V), 10)
+	expected = np.array([dijkstra(graph1, s)[0] for s in sources], dtype=float)
+	D, Pi = shortest_paths_many(graph1, sources, predecessors=True)
+	print(np.array_equal(D, expected))
+	print(np.array_equal(shortest_paths_many(graph1, sources, targets), expected[:, targets]))
+	print(np.array_equal(shortest_paths_many(graph1, sources, workers=4), expected))
+
+	# Paths read back from the predecessor matrix have the right weight.
+	all_equal = True
+	for row, s in enumerate(sources):
+		t = randint(0, card_V - 1)
+		path = matrix_path(Pi, row, s, t)
+		if path is None:
+			all_equal = all_equal and D[row, t] == np.inf
+		else:
+			weight = sum(graph1.find_edge(path[i], path[i + 1]).get_weight() for i in range(len(path) - 1))
+			all_equal = all_equal and weight == D[row, t]
+	print(all_equal)
+
+	# out as a memmap: a whole file, one opened at an offset, and a slice of one, which
+	# workers cannot reopen and so is filled from here.
+	directory = tempfile.mkdtemp()
+	filename = os.path.join(directory, "rows.dat")
+	all_equal = True
+	for offset in (0, 64):
+		with open(filename, "wb") as f:
+			f.write(b"\xff" * (offset + 8 * len(sources) * card_V))
+		out = np.memmap(filename, dtype=np.float64, mode='r+', shape=(len(sources), card_V), offset=offset)
+		shortest_paths_many(graph1, sources, workers=2, out=out)
+		all_equal = all_equal and np.array_equal(out, expected)
+		with open(filename, "rb") as f:
+			all_equal = all_equal and f.read(offset) == b"\xff" * offset  # header left alone
+	whole = np.memmap(filename, dtype=np.float64, mode='w+', shape=(len(sources) + 10, card_V))
+	shortest_paths_many(graph1, sources, workers=2, out=whole[10:])
+	all_equal = all_equal and np.array_equal(whole[10:], expected) and not whole[:10].any()
+	print(all_equal)
+	del out, whole
+	shutil.rmtree(directory)
+
+	# All pairs on a larger graph: one search at a time, batched, and batched over processes.
+	card_V = 1000
+	graph2 = generate_random_graph(card_V, 0.006, True, False, True, 1, 10)
+	start = time.perf_counter()
+	rows = [dijkstra_lazy(graph2, s)[0] for s in range(card_V)]
+	print(f"dijkstra_lazy per source: {time.perf_counter() - start:.2f}s")
+	start = time.perf_counter()
+	D2 = shortest_paths_many(graph2, range(card_V))
+	print(f"shortest_paths_many:      {time.perf_counter() - start:.2f}s")
+	start = time.perf_counter()
+	D3 = shortest_paths_many(graph2, range(card_V), workers=os.cpu_count())
+	print(f"with {os.cpu_count()} workers:          {time.perf_counter() - start:.2f}s")
+	print(np.array_equal(D2, np.array(rows, dtype=float)) and np.array_equal(D2, D3))
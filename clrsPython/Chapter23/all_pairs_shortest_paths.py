@@ -92,6 +92,56 @@ def faster_apsp(W, n):
 	return L
 
 
+def min_plus_product(A, B, max_bytes=1 << 26):
+	"""Return the min-plus product C of two matrices, with C[i,j] = min over k of
+	A[i,k] + B[k,j], the operation that extend_shortest_paths performs.
+
+	Arguments:
+	A -- p x q numpy array
+	B -- q x r numpy array
+	max_bytes -- bound on the temporary memory used.  The rows of C are computed a
+	chunk at a time, each as a running minimum over k of a chunk x r block of sums
+	A[i,k] + B[k,j], so that a block never exceeds max_bytes.
+	"""
+	p, q = A.shape
+	r = B.shape[1]
+	C = np.full((p, r), np.inf, dtype=np.result_type(A, B, float))
+	if p == 0 or q == 0 or r == 0:
+		return C  # nothing to add up; a sum over no k is inf
+	chunk = max(1, min(p, max_bytes // (r * C.itemsize)))
+	sums = np.empty((chunk, r), dtype=C.dtype)
+	for i in range(0, p, chunk):
+		C_rows = C[i:i+chunk]
+		block = sums[:len(C_rows)]
+		for k in range(q):
+			np.add(A[i:i+chunk, k:k+1], B[k, :], out=block)
+			np.minimum(C_rows, block, out=C_rows)
+	return C
+
+
+def faster_apsp_vectorized(W, n, max_bytes=1 << 26):
+	"""Compute all-pairs shortest paths for a weighted directed graph by repeated
+	squaring with min_plus_product, stopping early once squaring no longer changes L.
+
+	Arguments:
+	W -- the weighted adjacency matrix for the graph, but with 0 on the diagonal
+	n -- each matrix is n x n
+	max_bytes -- bound on the temporary memory of each product
+	Returns:
+	L -- matrix of shortest-path weights, where L[i,j] is the weight of a
+	shortest path from vertex i to vertex j
+	"""
+	L = np.array(W, dtype=float)
+	r = 1
+	while r < n-1:
+		M = min_plus_product(L, L, max_bytes)  # compute M = L^2
+		r *= 2
+		if np.array_equal(M, L):
+			break  # shortest paths have at most r/2 edges, so further squaring changes nothing
+		L = M
+	return L
+
+
 def initialize_L_0(n):
 	"""Create and return the L_0 matrix, with 0 on the diagonal and infinity everywhere else."""
 	L_0 = np.ndarray((n,n))
@@ -145,3 +195,25 @@ if __name__ == "__main__":
 	faster_L = faster_apsp(W, n)
 	print(faster_L)
 	print(np.array_equal(slow_L, faster_L))
+	print(np.array_equal(faster_apsp_vectorized(W, n), faster_L))
+	print()
+
+	# Empty matrices.
+	print(min_plus_product(np.zeros((0, 3)), np.zeros((3, 4))).shape,
+		  min_plus_product(np.zeros((2, 0)), np.zeros((0, 2))).tolist(),
+		  min_plus_product(np.zeros((2, 3)), np.zeros((3, 0))).shape,
+		  faster_apsp_vectorized(np.zeros((0, 0)), 0).shape)
+	print()
+
+	# Mid-sized network: vectorized repeated squaring against Floyd-Warshall.
+	import time
+	from floyd_warshall import floyd_warshall_vectorized
+	n = 500
+	W = create_W(generate_random_graph(n, 0.01, True, True, True, 1, 10).adjacency_matrix(), n)
+	start = time.perf_counter()
+	L = faster_apsp_vectorized(W, n)
+	print(f"faster_apsp_vectorized, {n} vertices: {time.perf_counter() - start:.2f}s")
+	start = time.perf_counter()
+	d = floyd_warshall_vectorized(W, n)
+	print(f"floyd_warshall_vectorized, {n} vertices: {time.perf_counter() - start:.2f}s")
+	print(np.array_equal(L, d))
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# distance_store.py
+
+# A disk-backed all-pairs distance matrix.  The n x n matrix lives in a numpy.memmap,
+# so only the rows in use need to be in memory, and a narrow dtype such as uint16
+# (whole minutes) takes a quarter of the space of float64.  Row u is filled in by a
+# single-source Dijkstra search from u the first time it is needed, and a flag per row
+# records which rows are done, so the work is kept across runs.
+#
+# Files, for a store at path:
+#   path        -- the distance matrix, n x n of dtype
+#   path.rows   -- one byte per row, 1 once the row has been computed
+#   path.json   -- the number of vertices, the dtype, and a checksum of the graph; a
+#                  store built for a different graph is discarded and started afresh
+
+import json
+import os
+import zlib
+
+import numpy as np
+
+from clrsPython.Chapter22.dijkstra import dijkstra_lazy
+from clrsPython.Chapter22.shortest_paths_many import shortest_paths_many
+from clrsPython.UtilityFunctions.csr_graph import CSRGraph
+
+
+class DistanceStore:
+
+	def __init__(self, G, path, dtype=np.float64):
+		"""Open the distance store at path for graph G, creating it if needed.
+
+		Arguments:
+		G -- a weighted graph with nonnegative weights (AdjacencyListGraph or CSRGraph)
+		path -- file name of the distance matrix
+		dtype -- element type of the matrix.  For an integer dtype all distances must be
+		whole numbers below its largest value, which is used to mean "unreachable".
+		"""
+		if not hasattr(G, "get_arrays"):
+			G = CSRGraph.from_adjacency_list_graph(G)
+		self.G = G
+		self.path = path
+		self.dtype = np.dtype(dtype)
+		self.card_V = G.get_card_V()
+		if np.issubdtype(self.dtype, np.integer):
+			self.unreachable = np.iinfo(self.dtype).max
+		else:
+			self.unreachable = np.inf
+
+		meta = {"card_V": self.card_V, "dtype": self.dtype.str, "checksum": self._checksum(G)}
+		shape = (self.card_V, self.card_V)
+		if self._read_meta() == meta:
+			self.matrix = np.memmap(path, dtype=self.dtype, mode='r+', shape=shape)
+			self.done = np.memmap(path + ".rows", dtype=np.uint8, mode='r+', shape=(self.card_V,))
+		else:
+			self.matrix = np.memmap(path, dtype=self.dtype, mode='w+', shape=shape)
+			self.done = np.memmap(path + ".rows", dtype=np.uint8, mode='w+', shape=(self.card_V,))
+			with open(path + ".json", "w") as f:
+				json.dump(meta, f)
+
+	@staticmethod
+	def _checksum(G):
+		"""Return a CRC of the graph's CSR arrays."""
+		crc = 0
+		for a in G.get_arrays():
+			if a is not None:
+				crc = zlib.crc32(a.tobytes(), crc)
+		return crc
+
+	def _read_meta(self):
+		"""Return the saved metadata, or None if there is none or the files are incomplete."""
+		try:
+			with open(self.path + ".json") as f:
+				meta = json.load(f)
+		except (OSError, ValueError):
+			return None
+		if not (os.path.exists(self.path) and os.path.exists(self.path + ".rows")):
+			return None
+		return meta
+
+	def _encode(self, d):
+		"""Convert a row of float distances to the store's dtype."""
+		d = np.asarray(d, dtype=np.float64)
+		if self.unreachable is np.inf:
+			return d.astype(self.dtype)
+		finite = np.isfinite(d)
+		if np.any(d[finite] >= self.unreachable) or np.any(d[finite] != np.floor(d[finite])):
+			raise ValueError("Distances do not fit in " + str(self.dtype) + "; use a wider or float dtype.")
+		return np.where(finite, d, self.unreachable).astype(self.dtype)
+
+	def _compute_row(self, u):
+		"""Run Dijkstra from u and save its row."""
+		self.matrix[u] = self._encode(dijkstra_lazy(self.G, u)[0])
+		self.done[u] = 1
+
+	def raw_row(self, u):
+		"""Return row u of the matrix in the store's dtype (unreachable marked by
+		self.unreachable), computing it first if needed."""
+		if not self.done[u]:
+			self._compute_row(u)
+		return self.matrix[u]
+
+	def row(self, u):
+		"""Return the distances from u to every vertex as floats, with inf for unreachable."""
+		r = self.raw_row(u).astype(np.float64)
+		r[r == self.unreachable] = np.inf
+		return r
+
+	def dist(self, u, v):
+		"""Return the distance from u to v, inf if v is unreachable from u."""
+		if not self.done[u] and not self.G.is_directed() and self.done[v]:
+			value = self.matrix[v, u]  # undirected, so row v already has the answer
+		else:
+			value = self.raw_row(u)[v]
+		return float('inf') if value == self.unreachable else value.item()
+
+	def compute_all(self, workers=None, batch_size=256):
+		"""Compute every row not yet done, batch_size sources at a time, spreading each
+		batch over worker processes if workers is more than 1."""
+		missing = np.flatnonzero(self.done == 0)
+		for start in range(0, len(missing), batch_size):
+			sources = missing[start:start + batch_size].tolist()
+			D = shortest_paths_many(self.G, sources, workers=workers)
+			for row, u in enumerate(sources):
+				self.matrix[u] = self._encode(D[row])
+			self.done[sources] = 1
+		self.flush()
+
+	def num_computed(self):
+		"""Return how many rows have been computed so far."""
+		return int(self.done.sum())
+
+	def to_array(self, workers=None):
+		"""Return the whole matrix as a float64 array, with inf for unreachable."""
+		self.compute_all(workers)
+		D = np.array(self.matrix, dtype=np.float64)
+		D[np.asarray(self.matrix) == self.unreachable] = np.inf
+		return D
+
+	def export(self, path, workers=None):
+		"""Save the whole matrix, in the store's dtype, to a NumPy .npy file."""
+		self.compute_all(workers)
+		np.save(path, np.asarray(self.matrix))
+
+	def flush(self):
+		"""Write computed rows out to disk."""
+		self.matrix.flush()
+		self.done.flush()
+
+
+# Testing
+if __name__ == "__main__":
+
+	import tempfile
+	import time
+	from random import randint
+	from clrsPython.Chapter22.dijkstra import dijkstra
+	from clrsPython.UtilityFunctions.adjacency_list_graph import AdjacencyListGraph
+	from clrsPython.UtilityFunctions.generate_random_graph import generate_random_graph
+
+	directory = tempfile.mkdtemp()
+
+	# Directed graph, float64 and uint16 stores agree with Dijkstra.
+	card_V = 200
+	graph1 = generate_random_graph(card_V, 0.02, True, True, True, 1, 10)
+	float_store = DistanceStore(graph1, os.path.join(directory, "float.dist"))
+	small_store = DistanceStore(graph1, os.path.join(directory, "small.dist"), np.uint16)
+	all_equal = True
+	for _ in range(300):
+		u, v = randint(0, card_V - 1), randint(0, card_V - 1)
+		expected = dijkstra(graph1, u)[0][v]
+		all_equal = all_equal and float_store.dist(u, v) == expected == small_store.dist(u, v)
+	print(all_equal, small_store.num_computed(), "rows computed on demand")
+	print(np.array_equal(small_store.to_array(), float_store.to_array()))
+
+	# Rows persist: reopening finds them done, and a changed graph starts afresh.
+	small_store.flush()
+	print(DistanceStore(graph1, os.path.join(directory, "small.dist"), np.uint16).num_computed() == card_V)
+	if graph1.has_edge(0, 1):
+		graph1.delete_edge(0, 1)
+	else:
+		graph1.insert_edge(0, 1, 1)
+	print(DistanceStore(graph1, os.path.join(directory, "small.dist"), np.uint16).num_computed() == 0)
+
+	# Fractional weights do not fit an integer dtype.
+	graph2 = AdjacencyListGraph(2, True, True)
+	graph2.insert_edge(0, 1, 0.5)
+	try:
+		DistanceStore(graph2, os.path.join(directory, "bad.dist"), np.uint16).dist(0, 1)
+	except ValueError as e:
+		print(e)
+
+	# Larger undirected network: warm up once, then lookups are O(1).
+	card_V = 1500
+	graph3 = generate_random_graph(card_V, 0.004, True, False, True, 1, 10)
+	store = DistanceStore(graph3, os.path.join(directory, "large.dist"), np.uint16)
+	start = time.perf_counter()
+	store.compute_all()
+	print(f"Warm-up, {card_V} vertices: {time.perf_counter() - start:.2f}s, "
+		  f"{os.path.getsize(store.path) / 2**20:.1f} MiB on disk")
+	start = time.perf_counter()
+	for _ in range(100000):
+		store.dist(randint(0, card_V - 1), randint(0, card_V - 1))
+	print(f"100000 lookups: {time.perf_counter() - start:.2f}s")
+	store.export(os.path.join(directory, "large.npy"))
+	print(np.load(os.path.join(directory, "large.npy")).shape)
+
+	import shutil
+	shutil.rmtree(directory)
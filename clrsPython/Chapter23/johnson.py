@@ -30,9 +30,29 @@
 #                                                                       #
 #########################################################################
 
+import os
+import tempfile
+from array import array
 import numpy as np
+from adjacency_list_graph import AdjacencyListGraph
+from csr_graph import CSRGraph
 from bellman_ford import bellman_ford
 from dijkstra import dijkstra
+from shortest_paths_many import shortest_paths_many
+
+
+def _augmented_graph(G):
+	"""Return G_prime, which is the same as G with an extra vertex and 0-weight edges
+	from the extra vertex to all other vertices.  The extra vertex is the next
+	available index."""
+	card_V = G.get_card_V()
+	s = card_V 	# index of additional vertex
+	G_prime = AdjacencyListGraph(card_V + 1, True, True)
+	for i in range(card_V):
+		G_prime.insert_edge(s, i, 0)  # 0-weight edges from s to all other vertices
+		for edge in G.get_adj_list(i):  # copy all other edges
+			G_prime.insert_edge(i, edge.get_v(), edge.get_weight())
+	return G_prime
 
 
 def johnson(G):
@@ -46,14 +66,7 @@ def johnson(G):
 	"""
 	card_V = G.get_card_V()
 	s = card_V 	# index of additional vertex
-	# Compute G_prime which is the same as g with with an extra vertex and
-	# 0-weight edges from the extra vertex to all other vertices. The extra vertex
-	# is the next available index. 
-	G_prime = AdjacencyListGraph(card_V + 1, True, True)
-	for i in range(card_V):
-		G_prime.insert_edge(s, i, 0)  # 0-weight edges from s to all other vertices
-		for edge in G.get_adj_list(i):  # copy all other edges
-			G_prime.insert_edge(i, edge.get_v(), edge.get_weight())
+	G_prime = _augmented_graph(G)
 
 	bellman_ford_d, pi, no_neg_cycle = bellman_ford(G_prime, s)
 	if not no_neg_cycle:  # negative weight cycle?
@@ -77,10 +90,63 @@ def johnson(G):
 		return d
 
 
+def johnson_parallel(G, workers=None, out_path=None):
+	"""Compute all-pairs shortest paths with Johnson's algorithm, running the
+	Dijkstra searches in a pool of worker processes.
+
+	The graph is reweighted once, in this process, into a compact read-only CSR copy
+	that each worker receives once when it starts.  Workers write their rows of the
+	result straight into a memory-mapped matrix, so rows are not sent back.
+
+	Arguments:
+	G -- a weighted, directed graph represented by adjacency lists
+	workers -- number of worker processes; defaults to the number of CPUs
+	out_path -- file for the memory-mapped result, which is kept and returned as an
+	np.memmap.  If None, a temporary file is used and an ordinary array returned.
+
+	Returns:
+	A matrix of shortest-path weights, or None if G has a negative-weight cycle
+	"""
+	card_V = G.get_card_V()
+	bellman_ford_d, pi, no_neg_cycle = bellman_ford(_augmented_graph(G), card_V)
+	if not no_neg_cycle:
+		print("The input graph contains a negative-weight cycle.")
+		return None
+	h = bellman_ford_d
+
+	# Reweight into a CSR copy.  The extra vertex is only ever a source, so leave it out.
+	csr = CSRGraph.from_adjacency_list_graph(G)
+	offsets, neighbors, weights = csr.get_arrays()
+	reweighted = array('d', weights)
+	for u in range(card_V):
+		for i in range(offsets[u], offsets[u + 1]):
+			reweighted[i] += h[u] - h[neighbors[i]]
+	csr = CSRGraph(card_V, offsets, neighbors, reweighted, True, csr.get_card_E())
+
+	if workers is None:
+		workers = os.cpu_count()
+	temporary = out_path is None
+	if temporary:
+		handle, out_path = tempfile.mkstemp(suffix=".dat")
+		os.close(handle)
+	d = np.memmap(out_path, dtype=np.float64, mode='w+', shape=(card_V, card_V))
+	try:
+		shortest_paths_many(csr, range(card_V), workers=workers, out=d)
+		# Undo the reweighting: d[u, v] += h[v] - h[u].
+		h = np.array(h[:card_V], dtype=np.float64)
+		d += h[np.newaxis, :]
+		d -= h[:, np.newaxis]
+		if temporary:
+			d = np.array(d)
+	finally:
+		if temporary:
+			os.remove(out_path)
+	return d
+
+
 # Testing
 if __name__ == "__main__":
 
-	from adjacency_list_graph import AdjacencyListGraph
 	from all_pairs_shortest_paths import create_W
 	from floyd_warshall import floyd_warshall
 	from generate_random_graph import generate_random_graph
@@ -106,3 +172,34 @@ if __name__ == "__main__":
 	print(johnson_d)
 	fw_d = floyd_warshall(create_W(graph2.adjacency_matrix(), n), n)
 	print(np.array_equal(johnson_d, fw_d))
+	parallel_d = johnson_parallel(graph2, 2)
+	print(parallel_d is None if johnson_d is None else np.array_equal(parallel_d, johnson_d))
+
+	# Sparse graph with negative edges but no negative-weight cycle: nonnegative weights
+	# w(u, v) shifted by p(u) - p(v) for random potentials p, which leaves the weight of
+	# every cycle unchanged.  Sequential against parallel, to a temporary file and to out_path.
+	import shutil
+	import time
+	from random import randint
+	n = 800
+	graph3 = generate_random_graph(n, 0.005, True, True, True, 0, 20)
+	p = [randint(0, 10) for _ in range(n)]
+	for u in range(n):
+		for edge in graph3.get_adj_list(u):
+			edge.set_weight(edge.get_weight() + p[u] - p[edge.get_v()])
+	print(any(edge.get_weight() < 0 for u in range(n) for edge in graph3.get_adj_list(u)))
+	start = time.perf_counter()
+	johnson_d = johnson(graph3)
+	print(f"johnson, {n} vertices: {time.perf_counter() - start:.2f}s")
+	all_equal = johnson_d is not None
+	for workers in (1, os.cpu_count()):
+		start = time.perf_counter()
+		parallel_d = johnson_parallel(graph3, workers)
+		print(f"johnson_parallel with {workers} workers: {time.perf_counter() - start:.2f}s")
+		all_equal = all_equal and np.array_equal(johnson_d, parallel_d)
+	directory = tempfile.mkdtemp()
+	out_d = johnson_parallel(graph3, 2, os.path.join(directory, "johnson.dat"))
+	all_equal = all_equal and isinstance(out_d, np.memmap) and np.array_equal(johnson_d, out_d)
+	del out_d
+	shutil.rmtree(directory)
+	print(all_equal)
@@ -34,13 +34,14 @@ def print_all_pairs_shortest_path(Pi, i, j):
 	"""Print the vertices on a shortest path from i to j. 
 	
 	Arguments:
-	Pi -- predecessor matrix: Pi[i, j] is the predecessor of j on some shortest path from i
+	Pi -- predecessor matrix: Pi[i, j] is the predecessor of j on some shortest path from i,
+	None or -1 if there is none
 	i -- starting index
 	j -- ending index
 	"""
 	if i == j:
 		print(i)
-	elif Pi[i, j] is None:
+	elif Pi[i, j] is None or Pi[i, j] < 0:
 		print("No path from", i, "to", j, "exists.")
 	else:
 		print_all_pairs_shortest_path(Pi, i, Pi[i, j])
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# reachability.py
+
+# Transitive closure with bitsets.  Row i of the closure is stored as a bitset whose
+# bit j says whether j is reachable from i, so the inner loop of Transitive-Closure,
+#     t[i,j] = t[i,j] or (t[i,k] and t[k,j])   for all j,
+# becomes a single OR of row k into row i.
+#
+# For large sparse graphs, ReachabilityIndex first collapses each strongly connected
+# component to one vertex: all vertices in a component reach exactly the same set.
+# The components form a DAG, and taking them in reverse topological order, the set
+# reachable from a component is itself plus the union of the sets of its successors,
+# one OR of Python-int bitsets per DAG edge.
+
+import numpy as np
+from strongly_connected_components import condensation, component_members
+
+
+def transitive_closure_bitset(G, n):
+	"""Return the transitive closure of a directed graph as packed bitset rows.
+
+	Arguments:
+	G -- a directed graph represented by adjacency lists (AdjacencyListGraph or CSRGraph)
+	n -- number of vertices
+
+	Returns:
+	An n x ceil(n/64) array of uint64 words in which bit j % 64 of word j // 64 in
+	row i is set if and only if there is a path in G from vertex i to vertex j.
+	unpack_closure turns it into the same bool matrix as transitive_closure.
+	"""
+	words = (n + 63) // 64
+	R = np.zeros((n, words), dtype=np.uint64)
+	one = np.uint64(1)
+	for i in range(n):
+		R[i, i >> 6] |= one << np.uint64(i & 63)
+		for edge in G.get_adj_list(i):
+			j = edge.get_v()
+			R[i, j >> 6] |= one << np.uint64(j & 63)
+
+	for k in range(n):
+		# The rows that reach k now also reach everything k reaches.
+		has_k = (R[:, k >> 6] >> np.uint64(k & 63)) & one
+		rows = np.flatnonzero(has_k)
+		R[rows] |= R[k]
+	return R
+
+
+def unpack_closure(R, n):
+	"""Turn packed bitset rows into an n x n bool matrix."""
+	bits = np.unpackbits(R.view(np.uint8), axis=1, bitorder='little')
+	return bits[:, :n].astype(bool)
+
+
+class ReachabilityIndex:
+
+	def __init__(self, G):
+		"""Build the reachability index of a directed graph from its strongly connected
+		components.
+
+		Argument:
+		G -- a directed graph represented by adjacency lists
+		"""
+		# Tarjan's algorithm numbers the components in topological order of the
+		# component DAG, so every DAG edge goes from a lower to a higher index.
+		component, dag = condensation(G)
+		self.component = component.tolist()
+		self.members = component_members(component)
+		self.num_dag_edges = dag.get_card_E()
+
+		# reach[c] has bit c2 set if component c2 is reachable from component c.
+		offsets, successors, _ = dag.get_arrays()
+		self.reach = [0] * len(self.members)
+		for c in range(len(self.members) - 1, -1, -1):
+			bits = 1 << c
+			for i in range(offsets[c], offsets[c + 1]):
+				bits |= self.reach[successors[i]]
+			self.reach[c] = bits
+
+	def reachable(self, u, v):
+		"""Return True if there is a path from vertex u to vertex v."""
+		return (self.reach[self.component[u]] >> self.component[v]) & 1 == 1
+
+	def reachable_from(self, u):
+		"""Return the sorted list of vertices reachable from vertex u, including u."""
+		bits = self.reach[self.component[u]]
+		result = []
+		for c, members in enumerate(self.members):
+			if (bits >> c) & 1:
+				result.extend(members)
+		result.sort()
+		return result
+
+	def to_matrix(self):
+		"""Return the transitive closure as a bool matrix, like transitive_closure."""
+		card_V = len(self.component)
+		t = np.zeros((card_V, card_V), dtype=bool)
+		for u in range(card_V):
+			t[u, self.reachable_from(u)] = True
+		return t
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from random import randint
+	from adjacency_list_graph import AdjacencyListGraph
+	from floyd_warshall import transitive_closure
+	from generate_random_graph import generate_random_graph
+
+	# Textbook example for transitive closure.
+	vertices = [1, 2, 3, 4]
+	n = len(vertices)
+	edges = [(2, 3), (2, 4), (3, 2), (4, 1), (4, 3)]
+	graph1 = AdjacencyListGraph(n)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]))
+	expected = transitive_closure(graph1, n)
+	print(np.array_equal(unpack_closure(transitive_closure_bitset(graph1, n), n), expected))
+	index1 = ReachabilityIndex(graph1)
+	print(np.array_equal(index1.to_matrix(), expected), index1.reachable(0, 3), index1.reachable(3, 0))
+
+	# Random graph checked against the triple loop.
+	n = 120
+	graph2 = generate_random_graph(n, 0.015, True, True, False)
+	expected = transitive_closure(graph2, n)
+	print(np.array_equal(unpack_closure(transitive_closure_bitset(graph2, n), n), expected),
+		  np.array_equal(ReachabilityIndex(graph2).to_matrix(), expected))
+
+	# Larger graphs.
+	n = 2000
+	graph3 = generate_random_graph(n, 0.001, True, True, False)
+	start = time.perf_counter()
+	R = transitive_closure_bitset(graph3, n)
+	print(f"Bitset Warshall, {n} vertices: {time.perf_counter() - start:.2f}s")
+	start = time.perf_counter()
+	index3 = ReachabilityIndex(graph3)
+	print(f"Condensed index, {n} vertices: {time.perf_counter() - start:.2f}s")
+	closure = unpack_closure(R, n)
+	print(all(index3.reachable(u, v) == closure[u, v]
+			  for u, v in ((randint(0, n - 1), randint(0, n - 1)) for _ in range(10000))))
+
+	n = 30000
+	graph4 = AdjacencyListGraph(n)
+	for u in range(n):
+		for _ in range(2):
+			v = randint(0, n - 1)
+			if v != u and not graph4.has_edge(u, v):
+				graph4.insert_edge(u, v)
+	start = time.perf_counter()
+	index4 = ReachabilityIndex(graph4)
+	print(f"Condensed index, {n} vertices: {time.perf_counter() - start:.2f}s, "
+		  f"{len(index4.members)} components, {index4.num_dag_edges} DAG edges")
@@ -83,13 +83,12 @@ class FlowNetwork(AdjacencyListGraph):
 	def insert_edge(self, u, v, c, original_edge=None):
 		"""Insert a FlowEdge into a FlowNetwork."""
 		# Cannot insert multiple edges between two vertices.
-		for edge in self.get_adj_list(u):
-			if edge.get_v() == v:
-				raise RuntimeError("An edge already exists.")
+		if self.has_edge(u, v):
+			raise RuntimeError("An edge already exists.")
 
 		# Append a new FlowEdge to an adjacency list and return a reference to it.
 		new_edge = FlowEdge(u, v, c, original_edge)
-		self.adj_lists[u].append(new_edge)
+		self.append_edge(u, new_edge)
 		return new_edge 
 
 	def insert_reverse_edge(self, c, edge):
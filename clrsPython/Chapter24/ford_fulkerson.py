@@ -46,46 +46,27 @@ def dfs(G, source, sink):
 	Returns:
 	pi -- if vertex v is found in the search, then pi[v] is the edge (u, v) that was explored to find v.
 	"""
-
-	global pi, sink_found
-	sink_found = False
 	pi = [None] * G.get_card_V()
 
-	# Find a path from the source to the sink, if one exists.
-	dfs_visit(G, source, sink)
+	# Find a path from the source to the sink, if one exists.  The stack holds an
+	# iterator over the edges still to explore from each vertex on the current path.
+	stack = [iter(G.get_adj_list(source))]
+	while stack:
+		for edge in stack[-1]:
+			v = edge.get_v()
+			# Explore this edge (u, v) if v has not been discovered (pi[v] is None)
+			# and the edge has positive capacity (it's in the residual network).
+			if pi[v] is None and edge.c > 0:
+				pi[v] = edge
+				if v == sink:
+					return pi  # no need to search any further
+				stack.append(iter(G.get_adj_list(v)))
+				break
+		else:
+			stack.pop()  # every edge from this vertex explored
 	return pi
 
 
-def dfs_visit(G, u, sink):
-	"""Perform depth-first search on a residual network in order to find an augmenting path
-	from the source to the sink.  Stops as soon as the sink is found.  Doesn't
-	run any functions upon discovering or finishing a vertex.
-
-	Arguments:
-	G -- a residual network
-	u -- index of the vertex currently searching from
-	sink -- index of sink
-	"""
-	global pi, sink_found
-
-	if sink_found:
-		return  # a previous call of this function found the sink
-
-	# Explore each adjacent edge, but only if the sink has not yet been found.
-	for edge in G.get_adj_list(u):
-		if sink_found:
-			return
-		v = edge.get_v()
-		# Explore this edge (u, v) if v has not been discovered (pi[v] is None)
-		# and the edge has positive capacity (it's in the residual network).
-		if pi[v] is None and edge.c > 0:
-			pi[v] = edge
-			if v == sink:
-				sink_found = True  # no need to search any further
-			else:
-				dfs_visit(G, v, sink)
-
-
 def ford_fulkerson(G, source, sink, search_func=dfs):
 	"""Find a maximum flow in a flow network from source to sink.
 
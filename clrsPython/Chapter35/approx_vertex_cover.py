@@ -71,7 +71,7 @@ def delete_edges(G, u):
 		G.delete_edge(v, u, False)  # don't delete (u, v) yet
 
 	# Then just delete the entire adjacency list for u.
-	G.get_adj_lists()[u].delete_all()
+	G.delete_adj_list(u)
 
 
 # Testing
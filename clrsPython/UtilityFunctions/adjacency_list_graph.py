@@ -30,6 +30,7 @@
 #                                                                       #
 #########################################################################
 
+import numpy as np
 from clrsPython.Chapter10.dll_sentinel import DLLSentinel
 from clrsPython.UtilityFunctions.adjacency_matrix_graph import AdjacencyMatrixGraph
 
@@ -74,7 +75,7 @@ class Edge:
 
 class AdjacencyListGraph:
 
-	def __init__(self, card_V, directed=True, weighted=False):
+	def __init__(self, card_V, directed=True, weighted=False, edge_index=True):
 		"""Initialize a graph implemented by an adjacency list. Vertices are
 		numbered from 0, so that adj_list[i] corresponds to adjacency list of vertex i.
 
@@ -82,6 +83,10 @@ class AdjacencyListGraph:
 		card_V -- number of vertices in this graph
 		directed -- boolean indicating whether the graph is directed
 		weighted -- boolean indicating whether edges are weighted
+		edge_index -- boolean indicating whether to keep, for each vertex u, a dictionary
+		mapping each neighbor v to the linked-list node holding edge (u, v), so that
+		find_edge, has_edge, and delete_edge take constant time instead of searching
+		the adjacency list.  Pass False to save the memory of the dictionaries.
 		"""
 		self.directed = directed
 		self.weighted = weighted
@@ -89,9 +94,92 @@ class AdjacencyListGraph:
 		for i in range(card_V):
 			# Each adjacency list is implemented as a linked list.
 			self.adj_lists[i] = DLLSentinel(get_key_func=Edge.get_v)  # will be a list of Edge objects
+		if edge_index:
+			self.edge_index = [{} for _ in range(card_V)]  # edge_index[u][v] is the node holding edge (u, v)
+		else:
+			self.edge_index = None
 		self.card_V = card_V
 		self.card_E = 0
 
+	@classmethod
+	def from_edges(cls, card_V, us, vs, weights=None, directed=True, weighted=False, dedupe="min",
+				   edge_index=True):
+		"""Build a graph from parallel arrays of edge endpoints and weights in one pass.
+		Validation and removal of duplicate edges are done once over the whole arrays,
+		rather than edge by edge as in insert_edge.  Edges that survive keep the order in
+		which they appear in the arrays.
+
+		Arguments:
+		card_V -- number of vertices in the graph
+		us, vs -- lists or numpy arrays of vertex indices; edge i goes from us[i] to vs[i]
+		weights -- list or numpy array of edge weights parallel to us and vs, None if unweighted
+		directed -- boolean indicating whether the graph is directed.  In an undirected graph,
+		(u, v) and (v, u) are the same edge.
+		weighted -- boolean indicating whether edges are weighted
+		dedupe -- what to do with repeated edges: "min" keeps the one with the smallest
+		weight, "first" keeps the first one, and "error" raises a RuntimeError as insert_edge does
+		edge_index -- as for the constructor
+		"""
+		if dedupe not in ("min", "first", "error"):
+			raise RuntimeError("Unknown dedupe option " + str(dedupe) + ".")
+		us = np.asarray(us, dtype=np.int64).ravel()
+		vs = np.asarray(vs, dtype=np.int64).ravel()
+		if len(us) != len(vs):
+			raise RuntimeError("Endpoint arrays must have the same length.")
+
+		# Check whether weights are missing, or whether weights are given in an unweighted graph.
+		if weighted:
+			if weights is None:
+				raise RuntimeError("Inserting unweighted edges in weighted graph.")
+			weights = np.asarray(weights).ravel()
+			if len(weights) != len(us):
+				raise RuntimeError("Weight array must be parallel to the endpoint arrays.")
+		elif weights is not None:
+			raise RuntimeError("Inserting weighted edges in unweighted graph.")
+
+		out_of_range = (us < 0) | (us >= card_V) | (vs < 0) | (vs >= card_V)
+		if out_of_range.any():
+			i = int(np.argmax(out_of_range))
+			raise RuntimeError("Edge (" + str(us[i]) + ", " + str(vs[i]) + ") has an endpoint out of range.")
+
+		# An undirected graph cannot have self-loops.
+		if not directed and (us == vs).any():
+			i = int(np.argmax(us == vs))
+			raise RuntimeError("Cannot insert self-loop (" + str(us[i]) + ", " + str(vs[i])
+							   + ") into undirected graph")
+
+		# Give each edge an integer key, the same for (u, v) and (v, u) if undirected.
+		if directed:
+			keys = us * card_V + vs
+		else:
+			keys = np.minimum(us, vs) * card_V + np.maximum(us, vs)
+
+		# Pick one edge per key.  Sorting by key, then by weight for "min", puts the edge
+		# to keep first within each run of equal keys.
+		if dedupe == "min" and weighted:
+			order = np.lexsort((np.arange(len(keys)), weights, keys))
+		else:
+			order = np.argsort(keys, kind="stable")
+		sorted_keys = keys[order]
+		first_in_run = np.ones(len(keys), dtype=bool)
+		first_in_run[1:] = sorted_keys[1:] != sorted_keys[:-1]
+		if dedupe == "error" and not first_in_run.all():
+			i = int(order[np.argmin(first_in_run)])
+			raise RuntimeError("An edge (" + str(us[i]) + ", " + str(vs[i]) + ") already exists.")
+		keep = np.sort(order[first_in_run])  # back in input order
+
+		# Fill the adjacency lists in one sweep.
+		G = cls(card_V, directed, weighted, edge_index)
+		kept_us = us[keep].tolist()
+		kept_vs = vs[keep].tolist()
+		kept_weights = weights[keep].tolist() if weighted else [None] * len(keep)
+		for u, v, weight in zip(kept_us, kept_vs, kept_weights):
+			G.append_edge(u, Edge(v, weight))
+			if not directed:
+				G.append_edge(v, Edge(u, weight))
+		G.card_E = len(kept_us)
+		return G
+
 	def get_card_V(self):
 		"""Return the number of vertices in this graph."""
 		return self.card_V
@@ -101,7 +189,8 @@ class AdjacencyListGraph:
 		return self.card_E
 
 	def get_adj_lists(self):
-		"""Return the adjacency lists of all the vertices in this graph."""
+		"""Return the adjacency lists of all the vertices in this graph.  Change them
+		only through the methods of this class, so that the edge index stays in sync."""
 		return self.adj_lists
 
 	def get_adj_list(self, u):
@@ -116,6 +205,26 @@ class AdjacencyListGraph:
 		"""Return a boolean indicating whether this graph is weighted."""
 		return self.weighted
 
+	def has_edge_index(self):
+		"""Return a boolean indicating whether this graph keeps an edge index."""
+		return self.edge_index is not None
+
+	def append_edge(self, u, edge):
+		"""Append an Edge object to the adjacency list of vertex u and record it in the
+		edge index.  Does no checking and does not change the edge count; for use by
+		insert_edge and by subclasses that store their own kinds of edges.
+		Return the new linked-list node."""
+		node = self.adj_lists[u].append(edge)
+		if self.edge_index is not None:
+			self.edge_index[u][edge.get_v()] = node
+		return node
+
+	def find_edge_node(self, u, v):
+		"""Return the linked-list node holding edge (u, v) if (u, v) is in this graph, None otherwise."""
+		if self.edge_index is not None:
+			return self.edge_index[u].get(v)
+		return self.adj_lists[u].search(v)
+
 	def insert_edge(self, u, v, weight=None):
 		"""Insert an edge between vertices u and v.
 
@@ -138,7 +247,7 @@ class AdjacencyListGraph:
 		# Cannot insert multiple edges between two vertices.
 		if self.has_edge(u, v):
 			raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
-		self.adj_lists[u].append(Edge(v, weight))
+		self.append_edge(u, Edge(v, weight))
 		self.card_E += 1
 
 		# If this graph is undirected, insert an edge from v to u.
@@ -146,11 +255,11 @@ class AdjacencyListGraph:
 			# Cannot insert multiple edges between two vertices.
 			if self.has_edge(v, u):
 				raise RuntimeError("An edge (" + str(v) + ", " + str(u) + ") already exists.")
-			self.adj_lists[v].append(Edge(u, weight))
+			self.append_edge(v, Edge(u, weight))
 
 	def find_edge(self, u, v):
 		"""Return the edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
-		edge = self.adj_lists[u].search(v)
+		edge = self.find_edge_node(u, v)
 		if edge is None:
 			return None
 		else:
@@ -163,22 +272,39 @@ class AdjacencyListGraph:
 	def delete_edge(self, u, v, delete_undirected=True):
 		"""Delete edge (u, v) if it exists.  No error if it does not exist.
 			Delete both directions if the graph is undirected and delete_undirected is True."""
-		edge = self.adj_lists[u].search(v)
+		edge = self.find_edge_node(u, v)
 		if edge is not None:
 			self.adj_lists[u].delete(edge)
+			if self.edge_index is not None:
+				del self.edge_index[u][v]
 			self.card_E -= 1
 
 		if not self.directed and delete_undirected:
-			edge = self.adj_lists[v].search(u)
+			edge = self.find_edge_node(v, u)
 			if edge is not None:
 				self.adj_lists[v].delete(edge)
+				if self.edge_index is not None:
+					del self.edge_index[v][u]
+
+	def delete_adj_list(self, u):
+		"""Delete every edge leaving vertex u, as if by delete_edge(u, v, False) for each
+		neighbor v.  Edges entering u are not deleted."""
+		self.card_E -= sum(1 for _ in self.adj_lists[u].iterator())
+		self.adj_lists[u].delete_all()
+		if self.edge_index is not None:
+			self.edge_index[u].clear()
 
 	def copy(self):
-		"""Return a copy of this graph."""
-		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		"""Return a copy of this graph.  The copy shares the Edge objects of this graph
+		and keeps an edge index if this graph does."""
+		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted, self.edge_index is not None)
 		copy.card_E = self.card_E
 		for u in range(self.card_V):
-			copy.adj_lists[u] = self.adj_lists[u].copy()
+			if self.edge_index is None:
+				copy.adj_lists[u] = self.adj_lists[u].copy()
+			else:
+				for edge in self.get_adj_list(u):
+					copy.append_edge(u, edge)
 		return copy
 
 	def get_edge_list(self):
@@ -194,7 +320,7 @@ class AdjacencyListGraph:
 
 	def transpose(self):
 		"""Return the transpose of this graph."""
-		xpose = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		xpose = AdjacencyListGraph(self.card_V, self.directed, self.weighted, self.edge_index is not None)
 		for u in range(self.card_V):
 			adj_list = self.get_adj_list(u)
 			for edge in adj_list:
@@ -311,3 +437,50 @@ if __name__ == "__main__":
 	# Test transpose.
 	xpose1 = graph1.transpose()
 	print(xpose1)
+
+	# The edge index must agree with searching the adjacency lists, after inserts,
+	# deletes, copies, and transposes.
+	graph4 = AdjacencyListGraph(30, True, True)
+	graph5 = AdjacencyListGraph(30, True, True, edge_index=False)
+	for i in range(200):
+		u, v = np.random.randint(30, size=2)
+		for g in (graph4, graph5):
+			try:
+				g.insert_edge(u, v, i)
+			except RuntimeError:
+				pass
+	for i in range(50):
+		u, v = np.random.randint(30, size=2)
+		graph4.delete_edge(u, v)
+		graph5.delete_edge(u, v)
+	graph4.delete_adj_list(3)
+	graph5.delete_adj_list(3)
+	same = str(graph4) == str(graph5) and graph4.get_card_E() == graph5.get_card_E()
+	for g4, g5 in ((graph4, graph5), (graph4.copy(), graph5.copy()), (graph4.transpose(), graph5.transpose())):
+		for u in range(30):
+			for v in range(30):
+				e4, e5 = g4.find_edge(u, v), g5.find_edge(u, v)
+				if (e4 is None) != (e5 is None) or (e4 is not None and e4.get_weight() != e5.get_weight()):
+					same = False
+	print("Edge index consistent:", same)
+
+	# Bulk construction should match inserting the surviving edges one at a time.
+	us = np.random.randint(30, size=300)
+	vs = np.random.randint(30, size=300)
+	ws = np.random.randint(1, 10, size=300)
+	loops = us == vs
+	graph6 = AdjacencyListGraph.from_edges(30, us[~loops], vs[~loops], ws[~loops], False, True, "min")
+	best = {}
+	for u, v, w in zip(us[~loops].tolist(), vs[~loops].tolist(), ws[~loops].tolist()):
+		key = (min(u, v), max(u, v))
+		if key not in best or w < best[key]:
+			best[key] = w
+	same = graph6.get_card_E() == len(best)
+	for (u, v), w in best.items():
+		if graph6.find_edge(u, v).get_weight() != w or graph6.find_edge(v, u).get_weight() != w:
+			same = False
+	print("Bulk construction keeps minimum weights:", same)
+	try:
+		AdjacencyListGraph.from_edges(3, [0, 1, 0], [1, 2, 1], dedupe="error")
+	except RuntimeError as e:
+		print(e)
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# csr_graph.py
+
+# Compressed sparse row (CSR) graph representation.  Stores the whole graph in
+# three flat arrays instead of one linked list of Edge objects per vertex:
+#   offsets[u] .. offsets[u+1]-1 -- positions in neighbors/weights of the edges leaving u
+#   neighbors[i] -- the vertex at the other end of edge i
+#   weights[i] -- the weight of edge i (weighted graphs only)
+# The graph is frozen once built.  It keeps the get_card_V/get_adj_list interface of
+# AdjacencyListGraph, so the traversal, shortest-path, and MST code runs on it unchanged.
+
+from array import array
+
+import numpy as np
+
+from clrsPython.UtilityFunctions.adjacency_list_graph import AdjacencyListGraph, Edge
+
+
+def _index_typecode(n):
+	"""Return the smallest array typecode able to hold the indices 0..n."""
+	return 'i' if n < 2**31 else 'q'
+
+
+def _weight_typecode(weights):
+	"""Return 'q' if every weight is an integer, 'd' otherwise."""
+	for w in weights:
+		if not float(w).is_integer() or isinstance(w, float):
+			return 'd'
+	return 'q'
+
+
+class CSRGraph:
+
+	def __init__(self, card_V, offsets, neighbors, weights=None, directed=True, card_E=None):
+		"""Initialize a frozen graph from already-built CSR arrays.  Normally called
+		through from_edges or from_adjacency_list_graph rather than directly.
+
+		Arguments:
+		card_V -- number of vertices in this graph
+		offsets -- array of card_V + 1 positions into neighbors
+		neighbors -- array of edge endpoints, grouped by source vertex
+		weights -- array of edge weights parallel to neighbors, None if unweighted
+		directed -- boolean indicating whether the graph is directed; an undirected
+		graph stores each edge in both directions
+		card_E -- number of edges; computed from neighbors if omitted
+		"""
+		if len(offsets) != card_V + 1:
+			raise RuntimeError("Offsets array must have card_V + 1 entries.")
+		if weights is not None and len(weights) != len(neighbors):
+			raise RuntimeError("Weights array must be parallel to the neighbors array.")
+		self.card_V = card_V
+		self.offsets = offsets
+		self.neighbors = neighbors
+		self.weights = weights
+		self.directed = directed
+		self.weighted = weights is not None
+		if card_E is None:
+			card_E = len(neighbors) if directed else len(neighbors) // 2
+		self.card_E = card_E
+
+	@classmethod
+	def from_edges(cls, card_V, edges, directed=True, weighted=False):
+		"""Build a CSR graph straight from an edge list.  Edges leaving each vertex keep
+		the order in which they appear in the list.
+
+		Arguments:
+		card_V -- number of vertices
+		edges -- iterable of (u, v) tuples, or (u, v, weight) tuples if weighted
+		directed -- boolean indicating whether the graph is directed
+		weighted -- boolean indicating whether edges are weighted
+		"""
+		us = []
+		vs = []
+		ws = [] if weighted else None
+		for edge in edges:
+			if weighted:
+				if len(edge) < 3 or edge[2] is None:
+					raise RuntimeError("Inserting unweighted edge (" + str(edge[0]) + ", " + str(edge[1])
+									   + ") in weighted graph.")
+				ws.append(edge[2])
+			elif len(edge) > 2 and edge[2] is not None:
+				raise RuntimeError("Inserting weighted edge (" + str(edge[0]) + ", " + str(edge[1])
+								   + ") in unweighted graph.")
+			u, v = int(edge[0]), int(edge[1])
+			if not (0 <= u < card_V and 0 <= v < card_V):
+				raise RuntimeError("Edge (" + str(u) + ", " + str(v) + ") has an endpoint out of range.")
+			# An undirected graph cannot have self-loops.
+			if not directed and u == v:
+				raise RuntimeError("Cannot insert self-loop (" + str(u) + ", " + str(v) + ") into undirected graph")
+			us.append(u)
+			vs.append(v)
+		card_E = len(us)
+
+		# An undirected edge is stored once in each direction.
+		if not directed:
+			us, vs = us + vs, vs + us
+			if weighted:
+				ws = ws + ws
+
+		# Counting sort of the edges by source vertex.
+		offsets = array('q', [0]) * (card_V + 1)
+		for u in us:
+			offsets[u + 1] += 1
+		for u in range(card_V):
+			offsets[u + 1] += offsets[u]
+		next_slot = array('q', offsets[:-1])
+		neighbors = array(_index_typecode(card_V), [0]) * len(us)
+		weights = array(_weight_typecode(ws), [0]) * len(us) if weighted else None
+		for i in range(len(us)):
+			u = us[i]
+			slot = next_slot[u]
+			neighbors[slot] = vs[i]
+			if weighted:
+				weights[slot] = ws[i]
+			next_slot[u] = slot + 1
+		del us, vs, ws, next_slot
+
+		# Cannot have multiple edges between two vertices.
+		for u in range(card_V):
+			lo, hi = offsets[u], offsets[u + 1]
+			if len(set(neighbors[lo:hi])) != hi - lo:
+				seen = set()
+				for v in neighbors[lo:hi]:
+					if v in seen:
+						raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
+					seen.add(v)
+
+		return cls(card_V, offsets, neighbors, weights, directed, card_E)
+
+	@classmethod
+	def from_arrays(cls, card_V, us, vs, weights=None, directed=True):
+		"""Build a CSR graph from parallel NumPy arrays of edge endpoints and weights,
+		doing the counting sort and the checks of from_edges as whole-array operations.
+		Edges leaving each vertex keep the order in which they appear in the arrays.
+
+		Arguments:
+		card_V -- number of vertices
+		us, vs -- arrays of vertex indices; edge i goes from us[i] to vs[i]
+		weights -- array of edge weights parallel to us and vs, None if unweighted
+		directed -- boolean indicating whether the graph is directed
+		"""
+		us = np.asarray(us, dtype=np.int64).ravel()
+		vs = np.asarray(vs, dtype=np.int64).ravel()
+		if len(us) != len(vs) or (weights is not None and len(weights) != len(us)):
+			raise RuntimeError("Edge arrays must have the same length.")
+		out_of_range = (us < 0) | (us >= card_V) | (vs < 0) | (vs >= card_V)
+		if out_of_range.any():
+			i = int(np.argmax(out_of_range))
+			raise RuntimeError("Edge (" + str(us[i]) + ", " + str(vs[i]) + ") has an endpoint out of range.")
+		# An undirected graph cannot have self-loops.
+		if not directed and (us == vs).any():
+			i = int(np.argmax(us == vs))
+			raise RuntimeError("Cannot insert self-loop (" + str(us[i]) + ", " + str(vs[i]) + ") into undirected graph")
+		card_E = len(us)
+
+		# An undirected edge is stored once in each direction.
+		if not directed:
+			us, vs = np.concatenate((us, vs)), np.concatenate((vs, us))
+			if weights is not None:
+				weights = np.concatenate((weights, weights))
+
+		order = np.argsort(us, kind='stable')
+		sorted_us = us[order]
+		sorted_vs = vs[order]
+
+		# Cannot have multiple edges between two vertices.
+		keys = sorted_us * card_V + sorted_vs
+		unique_keys, counts = np.unique(keys, return_counts=True)
+		if len(unique_keys) != len(keys):
+			key = int(unique_keys[np.argmax(counts > 1)])
+			raise RuntimeError("An edge (" + str(key // card_V) + ", " + str(key % card_V) + ") already exists.")
+
+		offsets = np.zeros(card_V + 1, dtype=np.int64)
+		np.cumsum(np.bincount(sorted_us, minlength=card_V), out=offsets[1:])
+		index_typecode = _index_typecode(card_V)
+		neighbors = array(index_typecode)
+		neighbors.frombytes(sorted_vs.astype(np.int32 if index_typecode == 'i' else np.int64).tobytes())
+		if weights is not None:
+			weights = np.asarray(weights)[order]
+			if np.issubdtype(weights.dtype, np.integer):
+				weights = array('q', weights.astype(np.int64).tobytes())
+			else:
+				weights = array('d', weights.astype(np.float64).tobytes())
+		return cls(card_V, array('q', offsets.tobytes()), neighbors, weights, directed, card_E)
+
+	@classmethod
+	def from_adjacency_list_graph(cls, G):
+		"""Build a CSR graph holding the same edges as G, in the same adjacency-list order."""
+		card_V = G.get_card_V()
+		weighted = G.is_weighted()
+		offsets = array('q', [0]) * (card_V + 1)
+		neighbors = array(_index_typecode(card_V))
+		weights = [] if weighted else None
+		for u in range(card_V):
+			for edge in G.get_adj_list(u):
+				neighbors.append(edge.get_v())
+				if weighted:
+					weights.append(edge.get_weight())
+			offsets[u + 1] = len(neighbors)
+		if weighted:
+			weights = array(_weight_typecode(weights), weights)
+		return cls(card_V, offsets, neighbors, weights, G.is_directed(), G.get_card_E())
+
+	def get_card_V(self):
+		"""Return the number of vertices in this graph."""
+		return self.card_V
+
+	def get_card_E(self):
+		"""Return the number of edges in this graph."""
+		return self.card_E
+
+	def get_adj_list(self, u):
+		"""Return an iterator for the adjacency list of vertex u.  The Edge objects are
+		created on the fly and are not stored in the graph."""
+		neighbors = self.neighbors
+		weights = self.weights
+		for i in range(self.offsets[u], self.offsets[u + 1]):
+			yield Edge(neighbors[i], None if weights is None else weights[i])
+
+	def get_neighbors(self, u):
+		"""Return the vertices adjacent to u as an array slice, without creating Edge objects."""
+		return self.neighbors[self.offsets[u]:self.offsets[u + 1]]
+
+	def get_degree(self, u):
+		"""Return the number of edges leaving vertex u."""
+		return self.offsets[u + 1] - self.offsets[u]
+
+	def get_arrays(self):
+		"""Return the (offsets, neighbors, weights) arrays.  weights is None if unweighted."""
+		return self.offsets, self.neighbors, self.weights
+
+	def is_directed(self):
+		"""Return a boolean indicating whether this graph is directed."""
+		return self.directed
+
+	def is_weighted(self):
+		"""Return a boolean indicating whether this graph is weighted."""
+		return self.weighted
+
+	def find_edge(self, u, v):
+		"""Return an edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
+		try:
+			i = self.neighbors.index(v, self.offsets[u], self.offsets[u + 1])
+		except ValueError:
+			return None
+		return Edge(v, None if self.weights is None else self.weights[i])
+
+	def has_edge(self, u, v):
+		"""Return True if edge (u, v) is in this graph, False otherwise."""
+		return self.find_edge(u, v) is not None
+
+	def get_edge_list(self):
+		"""Return a Python list containing the edges of this graph."""
+		edge_list = []
+		for u in range(self.card_V):
+			for v in self.get_neighbors(u):
+				if self.directed or u < v:
+					edge_list.append((u, v))
+		return edge_list
+
+	def transpose(self):
+		"""Return the transpose of this graph.  An undirected graph is its own transpose,
+		and since the graph is frozen it is returned as is."""
+		if not self.directed:
+			return self
+		offsets = np.asarray(self.offsets)
+		sources = np.repeat(np.arange(self.card_V), np.diff(offsets))
+		weights = np.asarray(self.weights) if self.weights is not None else None
+		return CSRGraph.from_arrays(self.card_V, np.asarray(self.neighbors), sources, weights, True)
+
+	def get_nbytes(self):
+		"""Return the number of bytes taken by the offsets, neighbors, and weights arrays."""
+		nbytes = 0
+		for a in (self.offsets, self.neighbors, self.weights):
+			if a is not None:
+				nbytes += a.itemsize * len(a)
+		return nbytes
+
+	def to_adjacency_list_graph(self):
+		"""Return a mutable AdjacencyListGraph holding the same edges as this graph."""
+		G = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		for u in range(self.card_V):
+			for edge in self.get_adj_list(u):
+				v = edge.get_v()
+				if self.directed or u < v:
+					G.insert_edge(u, v, edge.get_weight() if self.weighted else None)
+		return G
+
+	def __str__(self):
+		"""Return the adjacency lists formatted as a string."""
+		return self.strmap()
+
+	def strmap(self, mapping_func=None):
+		"""Return the adjacency lists formatted as a string, but mapping vertex numbers
+		by a mapping function.  If mapping_func is None, then do not map."""
+		if mapping_func is None:
+			mapping_func = lambda i: i
+
+		result = ""
+		for i in range(self.card_V):
+			result += str(mapping_func(i)) + ": "
+			for edge in self.get_adj_list(i):
+				result += edge.strmap(mapping_func) + " "
+			result += "\n"
+		return result
+
+
+# Testing
+if __name__ == "__main__":
+
+	from clrsPython.Chapter20.bfs import bfs
+	from clrsPython.Chapter21.mst import kruskal, prim, get_total_weight
+	from clrsPython.Chapter22.dijkstra import dijkstra
+	from clrsPython.UtilityFunctions.generate_random_graph import generate_random_graph
+
+	# Textbook example from Chapter 22, built straight from an edge list.
+	vertices = ['s', 't', 'x', 'y', 'z']
+	edges = [('s', 't', 10), ('s', 'y', 5), ('t', 'x', 1), ('t', 'y', 2), ('x', 'z', 4),
+			('y', 't', 3), ('y', 'x', 9), ('y', 'z', 2), ('z', 's', 7), ('z', 'x', 6)]
+	graph1 = CSRGraph.from_edges(len(vertices),
+								 [(vertices.index(u), vertices.index(v), w) for u, v, w in edges], True, True)
+	print(graph1.strmap(lambda i: vertices[i]))
+	d, pi = dijkstra(graph1, vertices.index('s'))
+	print(d)  # should be [0, 8, 9, 5, 7]
+
+	# Duplicate edges are rejected, as in AdjacencyListGraph.
+	try:
+		CSRGraph.from_edges(3, [(0, 1), (1, 2), (0, 1)])
+	except RuntimeError as e:
+		print(e)
+
+	# Converting a random graph should give identical results for BFS, Dijkstra, and MSTs.
+	card_V = 200
+	graph2 = generate_random_graph(card_V, 0.05, True, False, True, 1, 10)
+	csr2 = CSRGraph.from_adjacency_list_graph(graph2)
+	print(csr2.get_card_E() == graph2.get_card_E())
+	print(csr2.get_edge_list() == graph2.get_edge_list())
+	print(bfs(csr2, 0) == bfs(graph2, 0))
+	print(dijkstra(csr2, 0)[0] == dijkstra(graph2, 0)[0])
+	print(get_total_weight(kruskal(csr2)) == get_total_weight(kruskal(graph2)))
+	print(get_total_weight(prim(csr2, 0)) == get_total_weight(prim(graph2, 0)))
+	print(str(csr2.to_adjacency_list_graph()) == str(graph2))
+	print("CSR arrays take " + str(csr2.get_nbytes()) + " bytes")
+
+	# Building from NumPy arrays gives the same graph as building from an edge list.
+	edge_list = [(u, v, graph2.find_edge(u, v).get_weight()) for u, v in graph2.get_edge_list()]
+	us, vs, ws = (np.array(column) for column in zip(*edge_list))
+	csr3 = CSRGraph.from_arrays(card_V, us, vs, ws, False)
+	csr4 = CSRGraph.from_edges(card_V, edge_list, False, True)
+	print(csr3.get_arrays() == csr4.get_arrays() and csr3.get_card_E() == csr4.get_card_E())
+	try:
+		CSRGraph.from_arrays(3, np.array([0, 1, 1]), np.array([1, 2, 0]), directed=False)
+	except RuntimeError as e:
+		print(e)
+	xpose = CSRGraph.from_adjacency_list_graph(generate_random_graph(100, 0.05, True, True, True)).transpose()
+	print(sorted(xpose.get_edge_list()) == sorted((v, u) for u, v in xpose.transpose().get_edge_list()))
@@ -1,18 +1,102 @@
 import sys
 import os
 import csv
+import math
+import warnings
+from typing import Iterator, NamedTuple, Optional, Union
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-def _is_number(s: str) -> bool:
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'London_Underground_data.csv')
+
+
+class StationRow(NamedTuple):
+    """A CSV row naming a station on a line: line, station, (blank), (blank)."""
+    line: str
+    station: str
+    lineno: int
+
+
+class EdgeRow(NamedTuple):
+    """A CSV row joining two stations on a line: line, a, b, minutes."""
+    line: str
+    a: str
+    b: str
+    minutes: int
+    lineno: int
+
+
+class MalformedRowError(ValueError):
+    """Raised by iter_csv_rows(errors="raise") for a row that fits neither schema."""
+
+    def __init__(self, path: str, lineno: int, reason: str):
+        super().__init__(f"{path}:{lineno}: {reason}")
+        self.path = path
+        self.lineno = lineno
+        self.reason = reason
+
+
+def _parse_minutes(s: str) -> Optional[int]:
+    """Return the travel time in whole minutes, or None if s is not a finite number."""
     try:
-        float(s)
-        return True
-    except ValueError:
-        return False
+        value = float(s)
+    except (ValueError, OverflowError):
+        return None
+    if not math.isfinite(value):
+        return None  # "inf", "nan", "1e400"
+    return int(value)
+
+
+def iter_csv_rows(csv_path: str = CSV_PATH, errors: str = "warn") -> Iterator[Union[StationRow, EdgeRow]]:
+    """
+    Stream typed rows from a tube network CSV in a single pass.
+
+    Each row is `line, station, "", ""` (yields a StationRow) or `line, a, b, minutes`
+    (yields an EdgeRow). Blank rows are skipped; a blank line name becomes "Missing Line".
+    Works on any file in this format, e.g. task2/Generated_Test_Data.csv.
+
+    Rows that fit neither schema are reported with their line number:
+        errors="warn"  - emit a warning and skip the row (default)
+        errors="raise" - raise MalformedRowError
+        errors="skip"  - skip the row silently
+    """
+    if errors not in ("warn", "raise", "skip"):
+        raise ValueError(f"errors must be 'warn', 'raise' or 'skip', not {errors!r}")
+
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        for row in reader:
+            cells = [c.strip() for c in row]
+            if not any(cells):
+                continue
+
+            line = cells[0] or "Missing Line"
+            station = cells[1] if len(cells) > 1 else ""
+            other = cells[2] if len(cells) > 2 else ""
+            time_text = cells[3] if len(cells) > 3 else ""
+
+            if station and not other and not time_text:
+                yield StationRow(line, station, reader.line_num)
+                continue
+
+            if station and other:
+                minutes = _parse_minutes(time_text)
+                if minutes is not None:
+                    yield EdgeRow(line, station, other, minutes, reader.line_num)
+                    continue
+                reason = f"travel time {time_text!r} is not a finite number" if time_text else "missing travel time"
+            elif not station:
+                reason = "missing station name"
+            else:
+                reason = "travel time given without a second station"
+
+            if errors == "raise":
+                raise MalformedRowError(csv_path, reader.line_num, reason)
+            if errors == "warn":
+                warnings.warn(f"{csv_path}:{reader.line_num}: skipping malformed row ({reason})", stacklevel=2)
 
 
-def read_csv_file(debug=False):
+def read_csv_file(debug=False, csv_path=CSV_PATH):
 
     """
     Data is formated as follows:
@@ -24,38 +108,17 @@ def read_csv_file(debug=False):
     if debug:
         It will dump the data to console to sanity check the data.
         Otherwise it will just return the data in their coresponding lists - StationRows, EdgeRows.
-    """
-
-    csv_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'London_Underground_data.csv')
-    try:
-        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
-            reader = csv.reader(f)
-            for i, row in enumerate(reader, start=1):
-                cells = [c.strip() for c in row]
 
-                if not any(cells):
-                    continue
-
-                if 'StationRows' not in locals():
-                    StationRows = []
-                if 'EdgeRows' not in locals():
-                    EdgeRows = []
-
-                if len(cells) >= 2 and cells[1] != "":
-                    line = cells[0] or "Missing Line"
-                    station = cells[1]
-                    if len(cells) < 4 or (len(cells) >= 4 and cells[2] == "" and (len(cells) < 4 or cells[3] == "")):
-                        StationRows.append(["StationRow", line, station])
-                        continue
-
-                if len(cells) >= 4 and cells[1] != "" and cells[2] != "" and _is_number(cells[3]):
-                    line = cells[0] or "Missing Line"
-                    a, b, t = cells[1], cells[2], cells[3]
-                    EdgeRows.append(["EdgeRow", line, a, b, t])
-                    continue
+    Materialises the whole file; use iter_csv_rows to stream large networks instead.
+    """
 
-    except Exception as e:
-        print(e)
+    StationRows = []
+    EdgeRows = []
+    for row in iter_csv_rows(csv_path):
+        if isinstance(row, StationRow):
+            StationRows.append(["StationRow", row.line, row.station])
+        else:
+            EdgeRows.append(["EdgeRow", row.line, row.a, row.b, str(row.minutes)])
 
     if not debug:
         return StationRows, EdgeRows
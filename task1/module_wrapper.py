@@ -1,4 +1,6 @@
-from task1.data_extract import read_csv_file
+from itertools import chain
+
+from task1.data_extract import read_csv_file, iter_csv_rows, StationRow, EdgeRow, CSV_PATH
 from clrsPython.Chapter11.chained_hashtable import ChainedHashTable
 
 def norm(s: str) -> str:
@@ -35,19 +37,30 @@ def _unwrap(node_or_obj):
     return getattr(node_or_obj, "data", node_or_obj)
 
 
-def build_index_from_rows(station_rows, edge_rows):
+def make_station_table() -> ChainedHashTable:
+    """Return an empty CLRS hashtable keyed by StationRecord.key."""
+    return ChainedHashTable(m=1021, get_key_func=lambda x: x.key)
+
+
+def build_index_from_rows(station_rows, edge_rows=()):
     """
-    Build the station index in two passes using the CLRS ChainedHashTable.
+    Build the station index using the CLRS ChainedHashTable.
+
+    Consumes its rows as a stream, so a generator from iter_csv_rows is indexed
+    in one pass without holding the rows in memory. Station ids are assigned in
+    the order stations first appear.
 
     Args:
-        station_rows: List["StationRow", line, station]
-        edge_rows: List["EdgeRow", line, a, b, t] (t is numeric text)
+        station_rows: iterable of StationRow/EdgeRow records (e.g. iter_csv_rows(path)),
+            or the legacy List["StationRow", line, station] from read_csv_file
+        edge_rows: legacy List["EdgeRow", line, a, b, t] (t is numeric text);
+            processed after station_rows
 
     Returns:
         hashtable: CLRS table keyed by normalised name - StationRecord
         records_by_id: List[StationRecord] indexed by station id
     """
-    ht = ChainedHashTable(m=1021, get_key_func=lambda x: x.key)
+    ht = make_station_table()
     records_by_id = []
 
     def get_or_create(station_name: str) -> StationRecord:
@@ -60,17 +73,26 @@ def build_index_from_rows(station_rows, edge_rows):
         records_by_id.append(rec)
         return rec
 
-    for tag, line, station in station_rows:
-        rec = get_or_create(station)
-        if line:
-            rec.lines.add(line)
-
-    for tag, line, a, b, t in edge_rows:
-        try:
-            time_min = int(float(t))
-        except ValueError:
+    for row in chain(station_rows, edge_rows):
+        if isinstance(row, StationRow) or (not isinstance(row, EdgeRow) and row[0] == "StationRow"):
+            if isinstance(row, StationRow):
+                line, station = row.line, row.station
+            else:
+                _tag, line, station = row
+            rec = get_or_create(station)
+            if line:
+                rec.lines.add(line)
             continue
 
+        if isinstance(row, EdgeRow):
+            line, a, b, time_min = row.line, row.a, row.b, row.minutes
+        else:
+            _tag, line, a, b, t = row
+            try:
+                time_min = int(float(t))
+            except ValueError:
+                continue
+
         ra = get_or_create(a)
         rb = get_or_create(b)
 
@@ -87,3 +109,8 @@ def build_index_from_rows(station_rows, edge_rows):
             rb.neighbors[ra.id] = (time_min, line)
 
     return ht, records_by_id
+
+
+def build_index_from_csv(csv_path: str = CSV_PATH):
+    """Stream a tube network CSV straight into the station index. Returns (hashtable, records_by_id)."""
+    return build_index_from_rows(iter_csv_rows(csv_path))
@@ -0,0 +1,203 @@
+"""
+Binary snapshot of the station index built by task1.module_wrapper.
+
+Re-parsing the CSV and rebuilding the hashtable on every start is most of the
+wall time of a short route query. A snapshot stores the finished index as
+flat int32 arrays plus UTF-8 name blobs, and is memory-mapped back in.
+
+File layout (all integers little-endian):
+    header              - see _HEADER below
+    name_offsets        - int32[n_stations + 1], byte offsets into the station name blob
+    line_name_offsets   - int32[n_lines + 1], byte offsets into the line name blob
+    station_line_offs   - int32[n_stations + 1], slices of station_line_ids per station
+    station_line_ids    - int32[n_memberships]
+    nbr_offsets         - int32[n_stations + 1], slices of the three neighbor arrays per station
+    nbr_ids             - int32[n_neighbors]
+    nbr_times           - int32[n_neighbors]
+    nbr_line_ids        - int32[n_neighbors], -1 where the line is None
+    station name blob, line name blob
+
+A snapshot is only used if its version matches SNAPSHOT_VERSION, the CSV's
+size, mtime and CRC-32 match the ones recorded when it was written, and the file
+is exactly as long as its header says. Anything else (a truncated or corrupt
+file) makes load_snapshot return None, so the caller rebuilds from the CSV.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from task1.module_wrapper import StationRecord, make_station_table
+
+SNAPSHOT_VERSION = 2
+_MAGIC = b"LUIX"
+# magic, version, csv size, csv mtime (ns), csv crc32, n_stations, n_lines, n_memberships, n_neighbors
+_HEADER = struct.Struct("<4sIQqIIIQQ")
+
+
+def snapshot_path_for(csv_path: str) -> str:
+    """Return the snapshot path used for a given CSV file (same name, .idx extension)."""
+    return os.path.splitext(csv_path)[0] + ".idx"
+
+
+def _csv_stamp(csv_path: str) -> tuple[int, int, int]:
+    """Return (size, mtime_ns, crc32) identifying the current contents of the CSV.
+    The CRC catches edits that keep the size and mtime, at the cost of one read of the
+    file, which is much cheaper than parsing it."""
+    with open(csv_path, "rb") as f:
+        st = os.fstat(f.fileno())
+        crc = zlib.crc32(f.read())
+    return st.st_size, st.st_mtime_ns, crc
+
+
+def _int32(values) -> array:
+    """Return an int32 array of the values, little-endian."""
+    a = array("i", values)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a
+
+
+def _blob(strings: list[str]) -> tuple[array, bytes]:
+    """Encode strings into one UTF-8 blob plus the offsets of each string in it."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = [0]
+    for e in encoded:
+        offsets.append(offsets[-1] + len(e))
+    return _int32(offsets), b"".join(encoded)
+
+
+def save_snapshot(records_by_id: list[StationRecord], csv_path: str, snapshot_path: str | None = None) -> str:
+    """
+    Write the index to a snapshot file keyed by the CSV's size, mtime and CRC.
+    The file is written to a temporary name and renamed, so readers never see
+    a partial snapshot.
+
+    Returns the snapshot path.
+    """
+    if snapshot_path is None:
+        snapshot_path = snapshot_path_for(csv_path)
+
+    line_ids: dict[str, int] = {}
+
+    def line_id(line: str | None) -> int:
+        if line is None:
+            return -1
+        if line not in line_ids:
+            line_ids[line] = len(line_ids)
+        return line_ids[line]
+
+    station_line_offs = [0]
+    station_line_ids = []
+    nbr_offsets = [0]
+    nbr_ids, nbr_times, nbr_line_ids = [], [], []
+    for rec in records_by_id:
+        for line in rec.lines:
+            station_line_ids.append(line_id(line))
+        station_line_offs.append(len(station_line_ids))
+        for nid, (t, line) in rec.neighbors.items():
+            nbr_ids.append(nid)
+            nbr_times.append(t)
+            nbr_line_ids.append(line_id(line))
+        nbr_offsets.append(len(nbr_ids))
+
+    name_offsets, name_blob = _blob([rec.name for rec in records_by_id])
+    line_name_offsets, line_blob = _blob(list(line_ids))
+    size, mtime_ns, crc = _csv_stamp(csv_path)
+    header = _HEADER.pack(_MAGIC, SNAPSHOT_VERSION, size, mtime_ns, crc, len(records_by_id),
+                          len(line_ids), len(station_line_ids), len(nbr_ids))
+
+    tmp_path = snapshot_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for a in (name_offsets, line_name_offsets, _int32(station_line_offs), _int32(station_line_ids),
+                  _int32(nbr_offsets), _int32(nbr_ids), _int32(nbr_times), _int32(nbr_line_ids)):
+            a.tofile(f)
+        f.write(name_blob)
+        f.write(line_blob)
+    os.replace(tmp_path, snapshot_path)
+    return snapshot_path
+
+
+def load_snapshot(csv_path: str, snapshot_path: str | None = None):
+    """
+    Memory-map a snapshot and rebuild the index from it.
+
+    Returns (hashtable, records_by_id) as build_index_from_rows does, or None if
+    there is no snapshot, it is from another version, the CSV has changed, or the
+    file is truncated or corrupt.
+    """
+    if snapshot_path is None:
+        snapshot_path = snapshot_path_for(csv_path)
+    try:
+        stamp = _csv_stamp(csv_path)
+        f = open(snapshot_path, "rb")
+    except OSError:
+        return None
+
+    try:
+        return _read_snapshot(f, stamp)
+    except (ValueError, IndexError, UnicodeDecodeError):
+        return None
+    finally:
+        f.close()
+
+
+def _read_snapshot(f, stamp: tuple[int, int, int]):
+    """Decode an open snapshot file, returning None if it does not match stamp or its
+    length does not match its header."""
+    file_size = os.fstat(f.fileno()).st_size
+    if file_size < _HEADER.size:
+        return None
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, size, mtime_ns, crc, n_st, n_lines, n_memb, n_nbr = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC or version != SNAPSHOT_VERSION or (size, mtime_ns, crc) != stamp:
+            return None
+        # The int32 arrays must fit before the offsets at their ends can be trusted.
+        blobs_start = _HEADER.size + 4 * (3 * (n_st + 1) + (n_lines + 1) + n_memb + 3 * n_nbr)
+        if file_size < blobs_start:
+            return None
+
+        pos = _HEADER.size
+
+        def take(count: int) -> list[int]:
+            nonlocal pos
+            a = array("i")
+            a.frombytes(mm[pos:pos + 4 * count])
+            if sys.byteorder == "big":
+                a.byteswap()
+            pos += 4 * count
+            return a.tolist()
+
+        name_offsets = take(n_st + 1)
+        line_name_offsets = take(n_lines + 1)
+        station_line_offs = take(n_st + 1)
+        station_line_ids = take(n_memb)
+        nbr_offsets = take(n_st + 1)
+        nbr_ids = take(n_nbr)
+        nbr_times = take(n_nbr)
+        nbr_line_ids = take(n_nbr)
+        if file_size != blobs_start + name_offsets[-1] + line_name_offsets[-1]:
+            return None
+        name_blob = mm[pos:pos + name_offsets[-1]]
+        pos += name_offsets[-1]
+        line_blob = mm[pos:pos + line_name_offsets[-1]]
+
+    lines = [line_blob[line_name_offsets[i]:line_name_offsets[i + 1]].decode("utf-8") for i in range(n_lines)]
+    ht = make_station_table()
+    records_by_id = []
+    for sid in range(n_st):
+        rec = StationRecord(name=name_blob[name_offsets[sid]:name_offsets[sid + 1]].decode("utf-8"), id_=sid)
+        for k in range(station_line_offs[sid], station_line_offs[sid + 1]):
+            rec.lines.add(lines[station_line_ids[k]])
+        for k in range(nbr_offsets[sid], nbr_offsets[sid + 1]):
+            lid = nbr_line_ids[k]
+            rec.neighbors[nbr_ids[k]] = (nbr_times[k], None if lid < 0 else lines[lid])
+        ht.insert(rec)
+        records_by_id.append(rec)
+    return ht, records_by_id
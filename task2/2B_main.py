@@ -10,7 +10,7 @@ for root, dirs, files in os.walk(clrs_dir):
     if root not in sys.path:
         sys.path.append(root)
 from clrsPython.UtilityFunctions.adjacency_list_graph import AdjacencyListGraph
-from clrsPython.Chapter22.dijkstra import dijkstra
+from clrsPython.Chapter22.dijkstra import dijkstra_lazy
 
 #Choice on which dataset to run
 choice_loop=True
@@ -126,35 +126,18 @@ while loop:
 
 start = time.time()
 
-#Initilise empty weighted graph
-G = AdjacencyListGraph(len(stations), weighted=True)
-added_edges = set()
-
-#Insert edges of both directions into the graph
-min_edges = {}
-
-for u, v, w in edges:
-    u_idx = vertex_to_index[u]
-    v_idx = vertex_to_index[v]
-
-    # normalize key (undirected edge)
-    key = tuple(sorted((u_idx, v_idx)))
-
-    # keep the smaller weight if duplicates exist
-    if key not in min_edges or w < min_edges[key]:
-        min_edges[key] = w
-
-# insert edges into graph (undirected)
-for (u_idx, v_idx), w in min_edges.items():
-    G.insert_edge(u_idx, v_idx, w)
-    G.insert_edge(v_idx, u_idx, w)
+#Build the undirected weighted graph in one pass, keeping the smaller weight if duplicates exist
+us = [vertex_to_index[u] for u, v, w in edges]
+vs = [vertex_to_index[v] for u, v, w in edges]
+ws = [w for u, v, w in edges]
+G = AdjacencyListGraph.from_edges(len(stations), us, vs, ws, directed=False, weighted=True, dedupe="min")
 
 #Convert user input to indices for Dijkstra
 source_idx = vertex_to_index[source]
 target_idx = vertex_to_index[target]
 
-#Runs Dijkstra
-dist, parent = dijkstra(G, source_idx)
+#Runs Dijkstra, stopping as soon as the target station is settled
+dist, parent = dijkstra_lazy(G, source_idx, target_idx)
 
 #Reformating the path from Dijkstra parent array
 def get_path(parent, target_idx, index_to_vertex):
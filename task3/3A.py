@@ -19,44 +19,16 @@ sys.path.insert(0, os.path.join(CLRS_ROOT, "Chapter20"))
 sys.path.insert(0, os.path.join(CLRS_ROOT, "Chapter10"))
 sys.path.insert(0, os.path.join(CLRS_ROOT, "UtilityFunctions"))
 
-# Import CLRS BFS
-from bfs import bfs
-
-# === Graph Helper Classes ===
-
-class Edge:
-    """Simple edge class so CLRS BFS can read neighbours"""
-
-    def __init__(self, v):
-        self._v = v
-
-    def get_v(self):
-        return self._v
-
-
-class Graph:
-    """Undirected graph structure that matches CLRS BFS requirements"""
-
-    def __init__(self, n):
-        self.n = n
-        self.adj = [[] for _ in range(n)]
-
-    def add_edge(self, u, v):
-        self.adj[u].append(Edge(v))
-        self.adj[v].append(Edge(u))
-
-    def get_card_V(self):
-        return self.n
-
-    def get_adj_list(self, u):
-        return self.adj[u]
+# Import CLRS BFS and graph
+from bfs import bfs_fast
+from adjacency_list_graph import AdjacencyListGraph
 
 
 def build_network():
-    G = Graph(5)
+    G = AdjacencyListGraph(5, False)
     edges = [(0, 1), (1, 2), (2, 3), (3, 4), (0, 3)]
     for u, v in edges:
-        G.add_edge(u, v)
+        G.insert_edge(u, v)
     return G
 
 
@@ -77,7 +49,7 @@ def get_path(pi, s, t):
 stations = {0: "A", 1: "B", 2: "C", 3: "D", 4: "E"}
 G = build_network()
 
-dist, pi = bfs(G, 0)  # BFS from A (0)
+dist, pi = bfs_fast(G, 0, target=4)  # BFS from A (0), stopping at E
 path = get_path(pi, 0, 4)  # A to E
 
 print("=== Task 3A: Fewest Stops")
@@ -17,49 +17,32 @@ sys.path.insert(0, os.path.join(CLRS_ROOT, "Chapter20"))
 sys.path.insert(0, os.path.join(CLRS_ROOT, "Chapter10"))
 sys.path.insert(0, os.path.join(CLRS_ROOT, "UtilityFunctions"))
 
-# CLRS BFS
-from bfs import bfs
-
-class Edge:
-    def __init__(self, v):
-        self._v = v
-    def get_v(self):
-        return self._v
-
-class Graph:
-    def __init__(self, n):
-        self.n = n
-        self.adj = [[] for _ in range(n)]
-    def add_edge(self, a, b):
-        # undirected edge
-        self.adj[a].append(Edge(b))
-        self.adj[b].append(Edge(a))
-    def get_card_V(self):
-        return self.n
-    def get_adj_list(self, u):
-        return self.adj[u]
+# CLRS BFS and graphs
+import numpy as np
+from bfs import bfs, bfs_fast
+from direction_optimizing_bfs import direction_optimizing_bfs
+from csr_graph import CSRGraph
 
 # ---- make random graph like a tube map but fake ----
 def build_random_graph(n, avg_degree=3):
-    G = Graph(n)
     # each station connects to a few random stations
-    for i in range(n):
-        for _ in range(avg_degree):
-            j = random.randint(0, n - 1)
-            if j != i:
-                G.add_edge(i, j)
-    return G
+    us = np.repeat(np.arange(n), avg_degree)
+    vs = np.random.randint(0, n, len(us))
+    keep = us != vs
+    # undirected edge; the same pair drawn twice is kept once
+    pairs = np.unique(np.minimum(us[keep], vs[keep]) * n + np.maximum(us[keep], vs[keep]))
+    return CSRGraph.from_arrays(n, pairs // n, pairs % n, directed=False)
 
 # test time
-def average_bfs_time(n, trials=30):
+def average_bfs_time(n, trials=30, search=bfs_fast):
     G = build_random_graph(n)
     total = 0
 
     for _ in range(trials):
         s = random.randint(0, n - 1)
-        t1 = time.time()
-        bfs(G, s)   # using the CLRS bfs
-        t2 = time.time()
+        t1 = time.perf_counter()
+        search(G, s)   # bfs_fast by default, or the CLRS bfs
+        t2 = time.perf_counter()
         total += (t2 - t1)
 
     return total / trials
@@ -72,8 +55,15 @@ if __name__ == "__main__":
 
     for n in sizes:
         avg = average_bfs_time(n)
+        clrs_avg = average_bfs_time(n, search=bfs)
         times.append(avg)
-        print(f"n = {n:4d} | avg BFS time = {avg:.6f} sec")
+        print(f"n = {n:4d} | avg BFS time = {avg:.6f} sec | CLRS bfs = {clrs_avg:.6f} sec")
+
+    # a million stations: low diameter, so direction-optimizing BFS pays off
+    n = 10**6
+    avg = average_bfs_time(n, trials=3)
+    do_avg = average_bfs_time(n, trials=3, search=direction_optimizing_bfs)
+    print(f"\nn = {n} | avg BFS time = {avg:.3f} sec | direction-optimizing = {do_avg:.3f} sec")
 
     # draw graph
     plt.plot(sizes, times, marker="o")
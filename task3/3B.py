@@ -14,31 +14,12 @@ sys.path.insert(0, os.path.join(CLRS_PATH, "Chapter20"))
 sys.path.insert(0, os.path.join(CLRS_PATH, "UtilityFunctions"))
 sys.path.insert(0, os.path.join(CLRS_PATH, "Chapter10"))
 
-from bfs import bfs
+import numpy as np
 
-
-# Graph + Edge
-class Edge:
-    def __init__(self, v):
-        self.v = v
-    def get_v(self):
-        return self.v
-
-
-class Graph:
-    def __init__(self, n):
-        self.n = n
-        self.adj = [[] for _ in range(n)]
-
-    def add_edge(self, a, b):
-        self.adj[a].append(Edge(b))
-        self.adj[b].append(Edge(a))
-
-    def get_card_V(self):
-        return self.n
-
-    def get_adj_list(self, u):
-        return self.adj[u]
+from bfs import bfs_fast
+from bit_parallel_bfs import all_pairs_hops
+from adjacency_list_graph import AdjacencyListGraph
+from csr_graph import CSRGraph
 
 
 # Load London Tube data
@@ -46,7 +27,7 @@ def load_tube_data():
     csv_path = os.path.join(ROOT, "data", "London_Underground_data.csv")
 
     stations = []
-    edges = set()
+    edges = {}  # used as an ordered set: edges stay in CSV order, so ties break the same way every run
 
     with open(csv_path, "r", encoding="utf-8") as f:
         read = csv.reader(f)
@@ -58,19 +39,17 @@ def load_tube_data():
             if s1 != "" and s2 != "":
                 stations.append(s1)
                 stations.append(s2)
-                edges.add((s1, s2))
+                edges[(s1, s2)] = None
 
     stations = sorted(set(stations))
     name_to_id = {name: i for i, name in enumerate(stations)}
 
-    G = Graph(len(stations))
+    # Undirected, so (a, b) and (b, a) are the same edge; keep one of each
+    us = [name_to_id[s1] for s1, s2 in edges]
+    vs = [name_to_id[s2] for s1, s2 in edges]
+    G = AdjacencyListGraph.from_edges(len(stations), us, vs, directed=False, dedupe="first")
 
-    for s1, s2 in edges:
-        a = name_to_id[s1]
-        b = name_to_id[s2]
-        G.add_edge(a, b)
-
-    return G, stations, name_to_id
+    return CSRGraph.from_adjacency_list_graph(G), stations, name_to_id
 
 
 def build_path(parent, start, end):
@@ -93,7 +72,7 @@ def run_route(G, stations, ids, start_name, end_name):
     start = ids[start_name]
     end = ids[end_name]
 
-    dist, parent = bfs(G, start)
+    dist, parent = bfs_fast(G, start, target=end)
     path = build_path(parent, start, end)
 
     station_names = [stations[p] for p in path]
@@ -103,10 +82,24 @@ def run_route(G, stations, ids, start_name, end_name):
     print("Stops:", dist[end])
 
 
+# Fewest stops between every pair of stations (64 start stations per BFS sweep)
+def stops_summary(G, stations):
+    hops = all_pairs_hops(G)
+    reachable = hops != np.iinfo(hops.dtype).max
+    np.fill_diagonal(reachable, False)
+
+    a, b = np.unravel_index(np.argmax(np.where(reachable, hops, 0)), hops.shape)
+
+    print("\nStops table:", len(stations), "x", len(stations), "stations")
+    print("Average stops between stations:", round(float(hops[reachable].mean()), 2))
+    print("Most stops:", stations[a], "->", stations[b], "=", hops[a, b])
+
+
 G, stations, ids = load_tube_data()
 
 run_route(G, stations, ids, "Tottenham Hale", "Wimbledon Park")
 run_route(G, stations, ids, "Baker Street", "Liverpool Street")
+stops_summary(G, stations)
 
 
 
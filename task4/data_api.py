@@ -14,10 +14,11 @@ Notes:
 """
 
 from __future__ import annotations
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Iterator
 
 from task4.data_extract import read_csv_file
 from task1.module_wrapper import build_index_from_rows
+from clrsPython.UtilityFunctions.adjacency_list_graph import AdjacencyListGraph
 
 
 def _norm(s: str) -> str:
@@ -212,6 +213,54 @@ def get_edge_info(a_name: str, b_name: str):
     return ra.neighbors.get(rb.id)
 
 
+def iter_edges() -> Iterator[Tuple[int, int, int, str | None]]:
+    """
+    Yield every undirected edge between active stations exactly once, as
+    (u_id, v_id, time_minutes, line) with u_id < v_id. Edges touching a
+    deactivated (or soft-deleted) station are skipped, as in utils.data_api.
+
+    Walks each StationRecord's neighbor map directly, so it runs in O(V + E)
+    instead of looking up every station pair. Neighbors are visited in id order,
+    so the edges come out sorted by (u_id, v_id).
+    """
+    if _HT is None or _BY_ID is None:
+        init_index()
+    for rec in _BY_ID:
+        if not getattr(rec, "active", True):
+            continue
+        for nid, (t, line) in sorted(rec.neighbors.items()):
+            if nid > rec.id and getattr(_BY_ID[nid], "active", True):
+                yield rec.id, nid, t, line
+
+
+def build_graph() -> tuple[AdjacencyListGraph, dict[int, str]]:
+    """
+    Build an undirected, weighted CLRS graph of the stations from iter_edges().
+    - Station IDs are used directly as vertex indices (0..N-1).
+    - Edges of inactive stations are left out, as in utils.data_api.build_graph;
+      unlike there, get_all_stations() here still names inactive stations, so they
+      stay in id_to_name as isolated vertices.
+    - Edge weights are travel times in minutes.
+    Returns: (graph, id_to_name)
+    """
+    stations = get_all_stations()
+    if not stations:
+        return AdjacencyListGraph(card_V=0, directed=False, weighted=True), {}
+
+    id_to_name = {sid: sname for (sid, sname) in stations}
+    n_vertices = max(id_to_name) + 1
+
+    us, vs, ws = [], [], []
+    for u, v, time_minutes, _line in iter_edges():
+        us.append(u)
+        vs.append(v)
+        ws.append(int(time_minutes))
+
+    # Task 1 already keeps the min time per pair, so there are no duplicates to merge.
+    G = AdjacencyListGraph.from_edges(n_vertices, us, vs, ws, directed=False, weighted=True, dedupe="error")
+    return G, id_to_name
+
+
 def get_total_station_count() -> int:
     """Return the number of stations in the global index."""
     if _HT is None or _BY_ID is None:
@@ -236,6 +285,8 @@ __all__ = [
     "delete_station_by_name",
     "create_edge",
     "get_edge_info",
+    "iter_edges",
+    "build_graph",
     "get_total_station_count",
     "get_all_stations",
 ]
@@ -6,9 +6,11 @@ for a small weighted network using Weighted_Test_Data.csv.
 Library components used:
 - AdjacencyListGraph from clrsPython/UtilityFunctions/adjacency_list_graph.py
 - mst_kruskal from clrsPython/Chapter21/mst.py
+- biconnected_components from clrsPython/Chapter20/biconnected_components.py
 
 Algorithm complexity: O(E log V) (Kruskal's algorithm), 
 where E is the number of edges and V is the number of vertices.
+Bridges and articulation points (single points of failure): O(V + E).
 
 """
 from __future__ import annotations
@@ -18,54 +20,25 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 
 from clrsPython.UtilityFunctions.adjacency_list_graph import AdjacencyListGraph
+from clrsPython.Chapter20.biconnected_components import biconnected_components
 from clrsPython.Chapter21.mst import kruskal
 
 from task4.data_api import (
     _norm,               
     init_index,          
-    get_all_stations,    
-    get_edge_info        
+    build_graph          
 )
 
 def build_graph_from_index() -> tuple[AdjacencyListGraph, dict[int, str]]:
     """
     Build an undirected, weighted CLRS graph using Task 1's station index.
     - Uses station IDs directly as CLRS vertex indices (0..N-1).
-    - Inserts an undirected weighted edge once per pair (u < v).
+    - Walks each station's neighbor map once (O(V + E)) via the data API.
     Returns: (graph, id_to_name)
     """
     # loads stations & edges once
     init_index()
-
-    # Station listing: [(id, name), ...]
-    stations = get_all_stations()   
-    if not stations:
-        # No stations loaded; return an empty graph
-        return AdjacencyListGraph(card_V=0, directed=False, weighted=True), {}
-
-    # Build ID<->Name maps (IDs are already stable from Task 1)
-    id_to_name = {sid: sname for (sid, sname) in stations}
-    station_ids = [sid for (sid, _name) in stations]
-    n_vertices = max(station_ids) + 1  # IDs are 0..N-1 by construction in Task 1
-
-    # Create weighted, undirected CLRS graph
-    G = AdjacencyListGraph(card_V=n_vertices, directed=False, weighted=True)
-
-    # Insert edges by scanning station pairs (u < v) and asking Task 1 for edge info
-    # get_edge_info(name_u, name_v) returns (time_minutes, line) or None.
-    names = [id_to_name[i] for i in range(n_vertices)]
-    for u in range(n_vertices):
-        name_u = names[u]
-        for v in range(u + 1, n_vertices):
-            name_v = names[v]
-            info = get_edge_info(name_u, name_v)
-            if info is None:
-                continue
-            time_minutes, _line = info
-            # CLRS AdjacencyListGraph forbids parallel edges; Task 1 already keeps the min time.
-            G.insert_edge(u, v, int(time_minutes))
-
-    return G, id_to_name
+    return build_graph()
 
 
 def run_mst_demo() -> None:
@@ -94,16 +67,17 @@ def run_mst_demo() -> None:
     print("\nMaximum closable connections:")
     print("=" * 50)
     
-    # Get all edges from original graph
+    # Get all edges from original graph, each once (u < v), straight from the adjacency lists
     all_edges = []
     for u in range(G.card_V):
-        for v in range(u + 1, G.card_V):
-            edge = G.find_edge(u, v)
-            if edge is not None:
+        for edge in G.get_adj_list(u):
+            v = edge.get_v()
+            if u < v:
                 weight = edge.get_weight()
                 station_u = _norm(id_to_name.get(u, str(u)))
                 station_v = _norm(id_to_name.get(v, str(v)))
                 all_edges.append((u, v, weight, station_u, station_v))
+    all_edges.sort()
     
     # Get MST edges
     mst_edges = set()
@@ -128,6 +102,25 @@ def run_mst_demo() -> None:
     else:
         print("No closable connections found - all connections are essential for connectivity.")
 
+    report_single_points_of_failure(G, id_to_name)
+
+
+def report_single_points_of_failure(G: AdjacencyListGraph, id_to_name: dict[int, str]) -> None:
+    """Print the connections and stations whose closure alone would disconnect the network."""
+    bridges, articulation_points, components = biconnected_components(G)
+
+    print("\nSingle points of failure:")
+    print("=" * 50)
+    print(f"Critical connections (bridges): {len(bridges)}")
+    for u, v in sorted(tuple(sorted(e)) for e in bridges):
+        station_u = _norm(id_to_name.get(u, str(u)))
+        station_v = _norm(id_to_name.get(v, str(v)))
+        print(f"  {station_u} — {station_v}")
+    print(f"Critical stations (articulation points): {len(articulation_points)}")
+    for u in articulation_points:
+        print(f"  {_norm(id_to_name.get(u, str(u)))}")
+    print(f"Biconnected sections: {len(components)}")
+
 
 if __name__ == "__main__":
     run_mst_demo()
\ No newline at end of file
@@ -10,9 +10,13 @@ This script implements:
 Library components used:
 - AdjacencyListGraph from clrsPython/UtilityFunctions/adjacency_list_graph.py
 - kruskal from clrsPython/Chapter21/mst.py
-- dijkstra from clrsPython/Chapter22/dijkstra.py
+- biconnected_components from clrsPython/Chapter20/biconnected_components.py
+- dijkstra_lazy from clrsPython/Chapter22/dijkstra.py
+- shortest_paths_many from clrsPython/Chapter22/shortest_paths_many.py
+- DistanceStore from clrsPython/Chapter23/distance_store.py (optional, see impact_analysis)
 
-Algorithm complexity: O(E log V) for Kruskal's MST
+Algorithm complexity: O(E log V) for Kruskal's MST, O(V + E) for bridges and
+articulation points
 """
 
 from __future__ import annotations
@@ -26,17 +30,20 @@ import numpy as np
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from clrsPython.UtilityFunctions.adjacency_list_graph import AdjacencyListGraph
+from clrsPython.Chapter20.biconnected_components import biconnected_components
 from clrsPython.Chapter21.mst import kruskal
-from clrsPython.Chapter22.dijkstra import dijkstra
+from clrsPython.Chapter22.dijkstra import dijkstra_lazy
+from clrsPython.Chapter22.shortest_paths_many import shortest_paths_many
+from clrsPython.Chapter23.distance_store import DistanceStore
 
 from utils.data_api import (
     _norm,
     init_index,
-    get_all_stations,
-    get_edge_info,
+    build_graph,
     get_station_id,
 )
 
+
 def build_path(pi: list, target: int) -> list[int]:
     """Reconstruct path from predecessor."""
     path = []
@@ -83,31 +90,9 @@ def generate_random_network(n_vertices: int, edge_probability: float = 0.15, max
 
 
 def build_graph_from_underground() -> tuple[AdjacencyListGraph, dict[int, str]]:
-    """Build an undirected, weighted CLRS graph using London Underground CVS data."""
+    """Build an undirected, weighted CLRS graph using London Underground CVS data (O(V + E))."""
     init_index()
-    
-    stations = get_all_stations()
-    if not stations:
-        return AdjacencyListGraph(card_V=0, directed=False, weighted=True), {}
-    
-    id_to_name = {sid: sname for (sid, sname) in stations}
-    station_ids = [sid for (sid, _name) in stations]
-    n_vertices = max(station_ids) + 1
-    
-    G = AdjacencyListGraph(card_V=n_vertices, directed=False, weighted=True)
-    
-    names = [id_to_name[i] for i in range(n_vertices)]
-    for u in range(n_vertices):
-        name_u = names[u]
-        for v in range(u + 1, n_vertices):
-            name_v = names[v]
-            info = get_edge_info(name_u, name_v)
-            if info is None:
-                continue
-            time_minutes, _line = info
-            G.insert_edge(u, v, int(time_minutes))
-    
-    return G, id_to_name
+    return build_graph()
 
 
 def empirical_performance_analysis():
@@ -208,16 +193,17 @@ def redundant_connections_analysis():
     print(f"FINAL CORE NETWORK BACKBONE TOTAL WEIGHT: {total_weight} minutes")
     print(f"{'='*80}")
     
-    # Find all edges in original graph
+    # Find all edges in original graph, each once (u < v), straight from the adjacency lists
     all_edges = []
     for u in range(G.get_card_V()):
-        for v in range(u + 1, G.get_card_V()):
-            edge = G.find_edge(u, v)
-            if edge is not None:
+        for edge in G.get_adj_list(u):
+            v = edge.get_v()
+            if u < v:
                 weight = edge.get_weight()
                 station_u = id_to_name.get(u, str(u))
                 station_v = id_to_name.get(v, str(v))
                 all_edges.append((u, v, weight, station_u, station_v))
+    all_edges.sort()
     
     # Find redundant connections (not in MST)
     redundant_connections = []
@@ -244,11 +230,53 @@ def redundant_connections_analysis():
         for i, (u, v, weight, station_u, station_v) in enumerate(redundant_connections[:20], 1):
             print(f"{i:2d}. {station_u:30s} — {station_v:30s}  ({weight} min)")
     
+    resilience_analysis(G, id_to_name)
+    
     return G, mst_graph, redundant_connections, id_to_name, all_edges
 
 
-def impact_analysis(G_original, G_mst, redundant_connections, id_to_name):
-    """Perform impact analysis by comparing paths with/without redundant connections."""
+def resilience_analysis(G, id_to_name):
+    """Report the single points of failure: connections and stations whose closure
+    alone would disconnect the network (bridges and articulation points, O(V + E))."""
+    print(f"\n{'='*80}")
+    print("SINGLE POINTS OF FAILURE")
+    print(f"{'='*80}\n")
+    
+    start = time.perf_counter()
+    bridges, articulation_points, components = biconnected_components(G)
+    end = time.perf_counter()
+    print(f"✓ Bridges and articulation points found in {end - start:.6f}s")
+    print(f"Critical connections (bridges): {len(bridges)}")
+    print(f"Critical stations (articulation points): {len(articulation_points)}")
+    print(f"Biconnected sections: {len(components)}")
+    
+    if bridges:
+        print(f"\nShowing first 20 critical connections:\n")
+        for i, (u, v) in enumerate(sorted(tuple(sorted(e)) for e in bridges)[:20], 1):
+            edge = G.find_edge(u, v)
+            station_u = id_to_name.get(u, str(u))
+            station_v = id_to_name.get(v, str(v))
+            print(f"{i:2d}. {station_u:30s} — {station_v:30s}  ({edge.get_weight()} min)")
+    
+    if articulation_points:
+        # Stations whose closure splits off the most track are listed first.
+        degree = {u: sum(1 for _ in G.get_adj_list(u)) for u in articulation_points}
+        ranked = sorted(articulation_points, key=lambda u: (-degree[u], u))
+        print(f"\nShowing first 20 critical stations (most connections first):\n")
+        for i, u in enumerate(ranked[:20], 1):
+            print(f"{i:2d}. {id_to_name.get(u, str(u)):30s}  ({degree[u]} connections)")
+    
+    return bridges, articulation_points
+
+
+def impact_analysis(G_original, G_mst, redundant_connections, id_to_name, store_dir=None):
+    """
+    Perform impact analysis by comparing paths with/without redundant connections.
+
+    The all-pairs distances are computed in memory. If store_dir is given, they are
+    kept there instead in DistanceStore files (whole minutes), so a later run on the
+    same network reuses the rows already computed.
+    """
     print(f"\n{'='*80}")
     print("IMPACT ANALYSIS: Original vs Backbone-Only Paths")
     print(f"{'='*80}\n")
@@ -267,9 +295,28 @@ def impact_analysis(G_original, G_mst, redundant_connections, id_to_name):
         mst_edge_set.add((u, v))
         mst_edge_set.add((v, u))
     
-    # Try to find paths that are affected
+    # Distances between every pair of stations, with and without the redundant
+    # connections, computed in batches over all cores.
     n = G_original.get_card_V()
-    
+    workers = os.cpu_count()
+    start = time.perf_counter()
+    if store_dir is None:
+        D_original = shortest_paths_many(G_original, range(n), workers=workers)
+        D_mst = shortest_paths_many(G_mst, range(n), workers=workers)
+    else:
+        store_original = DistanceStore(G_original, os.path.join(store_dir, "taskb_original.dist"), np.uint16)
+        store_mst = DistanceStore(G_mst, os.path.join(store_dir, "taskb_backbone.dist"), np.uint16)
+        D_original = store_original.to_array(workers)
+        D_mst = store_mst.to_array(workers)
+    end = time.perf_counter()
+
+    reachable = np.isfinite(D_original) & np.isfinite(D_mst) & (D_original > 0)
+    detour = (D_mst - D_original)[reachable]
+    print(f"All-pairs comparison over {int(reachable.sum()) // 2} station pairs ({end - start:.2f}s, {workers} workers):")
+    print(f"  Journeys made slower by closing redundant connections: {int((detour > 0).sum()) // 2}")
+    if detour.size > 0:
+        print(f"  Average extra time: {detour.mean():.1f} min, worst: {detour.max():.1f} min\n")
+
     # Pick some random pairs to test
     tested = 0
     interesting_pairs = []
@@ -282,34 +329,26 @@ def impact_analysis(G_original, G_mst, redundant_connections, id_to_name):
         
         tested += 1
         
-        # Find shortest path in original graph
-        try:
-            d_original, pi_original = dijkstra(G_original, u)
-            if d_original[v] == float('inf'):
-                continue
-            
-            path_original = build_path(pi_original, v)
-            
-            # Check if original path uses any redundant edges
-            uses_redundant = False
-            for i in range(len(path_original) - 1):
-                a, b = path_original[i], path_original[i + 1]
-                if (a, b) not in mst_edge_set and (b, a) not in mst_edge_set:
-                    uses_redundant = True
-                    break
-            
-            if uses_redundant:
-                # Find path in MST
-                d_mst, pi_mst = dijkstra(G_mst, u)
-                
-                if d_mst[v] != float('inf'):
-                    path_mst = build_path(pi_mst, v)
-                    time_original = d_original[v]
-                    time_mst = d_mst[v]
-                    
-                    interesting_pairs.append((u, v, path_original, path_mst, time_original, time_mst))
-        except Exception:
+        # Shortest path in original graph
+        if D_original[u, v] == float('inf'):
             continue
+        
+        path_original = build_path(dijkstra_lazy(G_original, u, v)[1], v)
+        
+        # Check if original path uses any redundant edges
+        uses_redundant = False
+        for i in range(len(path_original) - 1):
+            a, b = path_original[i], path_original[i + 1]
+            if (a, b) not in mst_edge_set and (b, a) not in mst_edge_set:
+                uses_redundant = True
+                break
+        
+        if uses_redundant and D_mst[u, v] != float('inf'):
+            path_mst = build_path(dijkstra_lazy(G_mst, u, v)[1], v)
+            time_original = D_original[u, v]
+            time_mst = D_mst[u, v]
+            
+            interesting_pairs.append((u, v, path_original, path_mst, time_original, time_mst))
     
     if len(interesting_pairs) == 0:
         print("Could not find paths using redundant connections.")
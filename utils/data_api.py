@@ -14,10 +14,12 @@ Notes:
 """
 
 from __future__ import annotations
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Iterator
 
-from task1.data_extract import read_csv_file
-from task1.module_wrapper import build_index_from_rows
+from task1.data_extract import CSV_PATH
+from task1.module_wrapper import build_index_from_csv
+from task1.snapshot import load_snapshot, save_snapshot
+from clrsPython.UtilityFunctions.adjacency_list_graph import AdjacencyListGraph
 
 
 def _norm(s: str) -> str:
@@ -30,15 +32,49 @@ def _unwrap(node_or_obj):
 
 _HT = None
 _BY_ID: List[object] | None = None
+_VERSION = 0  # bumped whenever the network changes; see get_graph_version()
 
 
-def init_index(force: bool = False) -> None:
-    """Build the global index once (idempotent). Call before using other functions."""
+def _bump_version() -> None:
+    """Record that the station network has changed."""
+    global _VERSION
+    _VERSION += 1
+
+
+def get_graph_version() -> int:
+    """
+    Return a counter that changes whenever the network is rebuilt or mutated
+    (stations inserted, activated, deactivated or deleted, edges created).
+    Caches of graphs or routes built from this index should key on it.
+    """
+    return _VERSION
+
+
+def init_index(force: bool = False, use_snapshot: bool = True) -> None:
+    """
+    Build the global index once (idempotent). Call before using other functions.
+
+    With use_snapshot, the index is loaded from the binary snapshot next to the
+    CSV when one exists for the CSV's current size/mtime/CRC and is intact;
+    otherwise it is built from the CSV and a fresh snapshot is written. force
+    always rebuilds from the CSV.
+    """
     global _HT, _BY_ID
     if _HT is not None and _BY_ID is not None and not force:
         return
-    station_rows, edge_rows = read_csv_file()
-    _HT, _BY_ID = build_index_from_rows(station_rows, edge_rows)
+    if use_snapshot and not force:
+        loaded = load_snapshot(CSV_PATH)
+        if loaded is not None:
+            _HT, _BY_ID = loaded
+            _bump_version()
+            return
+    _HT, _BY_ID = build_index_from_csv(CSV_PATH)
+    _bump_version()
+    if use_snapshot:
+        try:
+            save_snapshot(_BY_ID, CSV_PATH)
+        except OSError:
+            pass  # read-only data directory; just keep the in-memory index
 
 
 def is_operational(name: str) -> bool:
@@ -84,6 +120,7 @@ def activate_station(name: str) -> bool:
         return False
     rec = _unwrap(hit)
     rec.active = True
+    _bump_version()
     return True
 
 
@@ -96,6 +133,7 @@ def deactivate_station(name: str) -> bool:
         return False
     rec = _unwrap(hit)
     rec.active = False
+    _bump_version()
     return True
 
 def is_station_active(name: str) -> bool:
@@ -123,6 +161,7 @@ def insert_station(name: str) -> int:
     
     _HT.insert(rec)
     _BY_ID.append(rec)
+    _bump_version()
     
     return new_id
 
@@ -141,6 +180,7 @@ def delete_station_by_name(name: str) -> bool:
     
     rec = _unwrap(hit)
     rec.active = False
+    _bump_version()
     return True
 
 
@@ -200,6 +240,7 @@ def create_edge(a_name: str, b_name: str, time_minutes: int, line: str | None =
     if prev is None or t < prev[0]:
         rb.neighbors[ra.id] = (t, line)
 
+    _bump_version()
     return True
 
 
@@ -220,6 +261,51 @@ def get_edge_info(a_name: str, b_name: str):
     return ra.neighbors.get(rb.id)
 
 
+def iter_edges() -> Iterator[Tuple[int, int, int, str | None]]:
+    """
+    Yield every undirected edge between active stations exactly once, as
+    (u_id, v_id, time_minutes, line) with u_id < v_id. Edges touching a
+    deactivated (or soft-deleted) station are skipped, as in task4.data_api.
+
+    Walks each StationRecord's neighbor map directly, so it runs in O(V + E)
+    instead of looking up every station pair. Neighbors are visited in id order,
+    so the edges come out sorted by (u_id, v_id).
+    """
+    if _HT is None or _BY_ID is None:
+        init_index()
+    for rec in _BY_ID:
+        if not getattr(rec, "active", True):
+            continue
+        for nid, (t, line) in sorted(rec.neighbors.items()):
+            if nid > rec.id and getattr(_BY_ID[nid], "active", True):
+                yield rec.id, nid, t, line
+
+
+def build_graph() -> tuple[AdjacencyListGraph, dict[int, str]]:
+    """
+    Build an undirected, weighted CLRS graph of the active stations from iter_edges().
+    - Station IDs are used directly as vertex indices (0..N-1).
+    - Edge weights are travel times in minutes.
+    Returns: (graph, id_to_name)
+    """
+    stations = get_all_stations()
+    if not stations:
+        return AdjacencyListGraph(card_V=0, directed=False, weighted=True), {}
+
+    id_to_name = {sid: sname for (sid, sname) in stations}
+    n_vertices = max(id_to_name) + 1
+
+    us, vs, ws = [], [], []
+    for u, v, time_minutes, _line in iter_edges():
+        us.append(u)
+        vs.append(v)
+        ws.append(int(time_minutes))
+
+    # Task 1 already keeps the min time per pair, so there are no duplicates to merge.
+    G = AdjacencyListGraph.from_edges(n_vertices, us, vs, ws, directed=False, weighted=True, dedupe="error")
+    return G, id_to_name
+
+
 def get_total_station_count() -> int:
     """Return the number of active stations in the global index."""
     if _HT is None or _BY_ID is None:
@@ -235,6 +321,7 @@ def get_all_stations() -> list[tuple[int, str]]:
 
 __all__ = [
     "init_index",
+    "get_graph_version",
     "is_operational",
     "get_station_id",
     "get_station_name",
@@ -244,6 +331,8 @@ __all__ = [
     "delete_station_by_name",
     "create_edge",
     "get_edge_info",
+    "iter_edges",
+    "build_graph",
     "get_total_station_count",
     "get_all_stations",
 ]
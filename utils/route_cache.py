@@ -0,0 +1,215 @@
+"""
+LRU cache in front of shortest-path queries on the station network.
+
+Popular journeys are asked for again and again, so answers are kept in a
+bounded cache keyed by (source, target, graph_version). The version comes
+from utils.data_api.get_graph_version(), which changes whenever the network
+is mutated (create_edge, activate/deactivate/insert/delete station), so a
+mutation invalidates every cached answer and the graph is rebuilt on the
+next query.
+
+Origins that keep missing are "hot": the cache then runs one full
+single-source Dijkstra from them and answers every later journey from that
+origin out of the stored tree.
+
+Usage:
+    cache = RouteCache()
+    dist, path = cache.route(get_station_id("Victoria"), get_station_id("Bank"))
+    cache.cache_info()  # hit/miss counters
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from clrsPython.Chapter22.dijkstra import dijkstra_lazy
+from utils.data_api import build_graph, get_graph_version, init_index
+
+
+def _default_graph():
+    """Build the station graph from the data API."""
+    init_index()
+    G, _id_to_name = build_graph()
+    return G
+
+
+def _path_from(pi: list, s: int, t: int) -> Optional[list[int]]:
+    """Follow predecessors back from t to s. Returns None if t was not reached from s."""
+    path = [t]
+    while path[-1] != s:
+        prev = pi[path[-1]]
+        if prev is None:
+            return None
+        path.append(prev)
+    path.reverse()
+    return path
+
+
+class RouteCache:
+    """
+    Bounded LRU cache of routes and single-source trees.
+
+    Attributes:
+        max_routes - most (source, target) answers kept
+        max_trees - most single-source trees kept
+        hot_after - route misses from one origin before its whole tree is cached
+    """
+
+    def __init__(self, max_routes: int = 4096, max_trees: int = 32, hot_after: int = 3,
+                 graph_func: Callable = _default_graph, version_func: Callable[[], int] = get_graph_version):
+        """
+        graph_func builds the graph to search; version_func says when it must be
+        rebuilt. Both default to the data API, but any fixed graph can be cached
+        with e.g. RouteCache(graph_func=lambda: G, version_func=lambda: 0).
+        """
+        self.max_routes = max_routes
+        self.max_trees = max_trees
+        self.hot_after = hot_after
+        self._graph_func = graph_func
+        self._version_func = version_func
+        self._graph = None
+        self._version = None
+        self._routes: OrderedDict = OrderedDict()   # (s, t, version) -> (dist, path)
+        self._trees: OrderedDict = OrderedDict()    # (s, version) -> (d, pi)
+        self._origin_misses: OrderedDict = OrderedDict()  # s -> route misses since last tree
+        self._counters = {"hits": 0, "misses": 0, "tree_hits": 0, "tree_builds": 0,
+                          "evictions": 0, "invalidations": 0}
+
+    def graph(self):
+        """Return the current graph, rebuilding it (and dropping every entry) if the version moved on."""
+        version = self._version_func()
+        if self._graph is None or version != self._version:
+            if self._graph is not None:
+                self._counters["invalidations"] += 1
+            self.clear()
+            self._graph = self._graph_func()
+            self._version = self._version_func()  # building may itself init the index
+        return self._graph
+
+    def route(self, s: int, t: int) -> tuple[float, Optional[list[int]]]:
+        """Return (travel time, list of station ids) for s -> t; (inf, None) if unreachable."""
+        G = self.graph()
+        key = (s, t, self._version)
+        hit = self._routes.get(key)
+        if hit is not None:
+            self._routes.move_to_end(key)
+            self._counters["hits"] += 1
+            return hit
+
+        self._counters["misses"] += 1
+        tree = self._trees.get((s, self._version))
+        if tree is not None:
+            self._trees.move_to_end((s, self._version))
+            self._counters["tree_hits"] += 1
+            d, pi = tree
+        elif self._note_miss(s) >= self.hot_after:
+            d, pi = self.tree(s)
+        else:
+            d, pi = dijkstra_lazy(G, s, t)
+
+        result = (d[t], _path_from(pi, s, t))
+        self._put(self._routes, key, result, self.max_routes)
+        return result
+
+    def tree(self, s: int) -> tuple[list, list]:
+        """Return the full single-source (d, pi) from s, computing and caching it if needed."""
+        G = self.graph()
+        key = (s, self._version)
+        tree = self._trees.get(key)
+        if tree is not None:
+            self._trees.move_to_end(key)
+            return tree
+        self._counters["tree_builds"] += 1
+        tree = dijkstra_lazy(G, s)
+        self._put(self._trees, key, tree, self.max_trees)
+        self._origin_misses.pop(s, None)
+        return tree
+
+    def _note_miss(self, s: int) -> int:
+        """Count a route miss from origin s and return the count so far."""
+        count = self._origin_misses.pop(s, 0) + 1
+        self._origin_misses[s] = count
+        if len(self._origin_misses) > self.max_routes:
+            self._origin_misses.popitem(last=False)
+        return count
+
+    def _put(self, table: OrderedDict, key, value, limit: int) -> None:
+        """Insert into an LRU table, evicting the least recently used entries past limit."""
+        table[key] = value
+        while len(table) > limit:
+            table.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop every cached route and tree (counters are kept)."""
+        self._routes.clear()
+        self._trees.clear()
+        self._origin_misses.clear()
+
+    def cache_info(self) -> dict:
+        """Return hit/miss counters plus the current number of cached routes and trees."""
+        info = dict(self._counters)
+        info["routes"] = len(self._routes)
+        info["trees"] = len(self._trees)
+        return info
+
+
+__all__ = ["RouteCache"]
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m utils.route_cache
+    import random
+    from clrsPython.Chapter22.dijkstra import dijkstra
+    from clrsPython.UtilityFunctions.adjacency_list_graph import AdjacencyListGraph
+    from utils.data_api import activate_station, create_edge, deactivate_station, get_station_name
+
+    def matches_dijkstra(cache, G, pairs):
+        """Check cached answers against a fresh Dijkstra search, and that paths add up."""
+        for s, t in pairs:
+            dist, path = cache.route(s, t)
+            if dist != dijkstra(G, s)[0][t]:
+                return False
+            if path is not None and sum(G.find_edge(path[i], path[i + 1]).get_weight()
+                                        for i in range(len(path) - 1)) != dist:
+                return False
+        return True
+
+    # LRU eviction: a fixed random graph, room for 3 routes, trees never built.
+    random.seed(1)
+    G1 = AdjacencyListGraph(60, directed=False, weighted=True)
+    for u in range(60):
+        for v in range(u + 1, 60):
+            if random.random() < 0.08:
+                G1.insert_edge(u, v, random.randint(1, 9))
+    cache1 = RouteCache(max_routes=3, hot_after=10**9, graph_func=lambda: G1, version_func=lambda: 0)
+    print(matches_dijkstra(cache1, G1, [(0, 1), (0, 2), (1, 3), (0, 1), (2, 4), (0, 2)]))
+    # The hit on (0, 1) makes it most recent, so (2, 4) evicts (0, 2), and asking for
+    # (0, 2) again misses and evicts (1, 3).
+    info = cache1.cache_info()
+    print(info["hits"] == 1 and info["misses"] == 5 and info["evictions"] == 2 and info["routes"] == 3)
+
+    # Hot origin: the third miss from one origin builds its tree, which answers the rest.
+    cache2 = RouteCache(hot_after=3, graph_func=lambda: G1, version_func=lambda: 0)
+    print(matches_dijkstra(cache2, G1, [(5, t) for t in range(20)]))
+    info = cache2.cache_info()
+    print(info["tree_builds"] == 1 and info["tree_hits"] == 17 and info["trees"] == 1)
+
+    # Station network: answers before and after deactivate_station and create_edge.
+    init_index()
+    cache3 = RouteCache()
+    G3 = cache3.graph()
+    pairs = [tuple(random.sample(range(G3.get_card_V()), 2)) for _ in range(30)]
+    print(matches_dijkstra(cache3, G3, pairs))
+    s, t = next((s, t) for s, t in pairs if len(cache3.route(s, t)[1] or []) > 2)
+    middle = get_station_name(cache3.route(s, t)[1][1])
+    deactivate_station(middle)
+    G3 = cache3.graph()
+    print(matches_dijkstra(cache3, G3, pairs), cache3.cache_info()["invalidations"] == 1)
+    activate_station(middle)
+    create_edge(get_station_name(s), get_station_name(t), 1)
+    G3 = cache3.graph()
+    # Both mutations happened before the next query, so they count as one invalidation.
+    print(matches_dijkstra(cache3, G3, pairs), cache3.route(s, t) == (1, [s, t]),
+          cache3.cache_info()["invalidations"] == 2)